@@ -0,0 +1,163 @@
+"""Per-interaction argument binding overhead, before and after the
+precompiled :class:`~slash.models.ArgumentBinder`.
+
+``legacy`` is the binding of ``InteractionContext.from_interaction`` before
+the binder: the deepcopy of ``cmd.params``, popping the context parameter
+and ``get_ctx_kw``, copied unchanged. Both paths run on the same options
+with every entity in the cache, so neither fetches.
+
+Run with the package installed: ``python benchmarks/bench_binder.py``.
+
+Two runs on CPython 3.11.7 with discord.py 2.7.1, 100000 interactions each::
+
+    plain options (5): legacy 82.22 us, binder 2.19 us
+    entity options (3 + 2): legacy 80.10 us, binder 7.97 us
+
+    plain options (5): legacy 92.40 us, binder 2.81 us
+    entity options (3 + 2): legacy 80.18 us, binder 6.36 us
+
+Most of the legacy cost is the deepcopy of the parameters.
+"""
+import copy
+import time
+import asyncio
+import discord
+
+from slash.cache import TTLCache
+from slash.enums import OptionType
+from slash.models import ArgumentBinder, Option, get_signature_parameters
+
+from collections import Counter
+
+
+async def get_ctx_kw(ctx, params):
+    # unchanged from before the binder
+    bot, cmd, kwargs = ctx.bot, ctx.command, {}
+    if cmd is not None and len(ctx.data.options) > 0:
+        for k, _ in params.items():
+            for opt in ctx.data.options:
+                if k == opt.name:
+                    if opt.type == OptionType.USER:
+                        if ctx.guild:
+                            value = ctx.guild.get_member(opt.value) or await ctx.guild.fetch_member(opt.value)
+                        else:
+                            value = bot.get_user(opt.value) or await bot.fetch_user(opt.value)
+                    elif opt.type == OptionType.CHANNEL:
+                        if ctx.guild:
+                            value = ctx.guild.get_channel(opt.value) or await ctx.guild.fetch_channel(opt.value)
+                        else:
+                            value = bot.get_channel(opt.value) or await bot.fetch_channel(opt.value)
+                    elif opt.type == OptionType.ROLE:
+                        value = ctx.guild.get_role(opt.value)
+                    elif opt.type == OptionType.MENTIONABLE:
+                        value = discord.Object(opt.value)
+                    else:
+                        value = opt.value
+                    kwargs[k] = value
+    return kwargs
+
+
+async def legacy_bind(ctx, cmd):
+    # the part of from_interaction which bound the arguments
+    kwargs = {}
+    params = copy.deepcopy(cmd.params)
+    if cmd.cog and str(list(params.keys())[0]) in ("cls", "self"):
+        kwargs[str(params.pop(list(params.keys())[0]))] = cmd.cog
+    kwargs[str(params.pop(list(params.keys())[0]))] = ctx
+    return {**kwargs, **(await get_ctx_kw(ctx, params))}
+
+
+async def plain(ctx, name: str, amount: int, flag: bool, ratio: float, reason: str = None,
+                a: str = None, b: str = None, c: str = None):
+    pass
+
+
+async def entities(ctx, user: discord.Member, channel: discord.TextChannel, role: discord.Role,
+                   name: str, amount: int, reason: str = None):
+    pass
+
+
+class FakeGuild:
+    id = 1
+
+    def get_member(self, _id):
+        return ("member", int(_id))
+
+    def get_channel(self, _id):
+        return ("channel", int(_id))
+
+    def get_role(self, _id):
+        return ("role", int(_id))
+
+
+class FakeCommand:
+    cog = None
+
+    def __init__(self, callback):
+        self.params = get_signature_parameters(callback, callback.__globals__)
+
+
+class FakeClient:
+    def __init__(self):
+        self.resolve_stats = Counter()
+        self.entity_cache = TTLCache(16)
+
+
+class FakeContext:
+    bot = None
+
+    def __init__(self, command, options):
+        self.command = command
+        self.guild = FakeGuild()
+        self.client = FakeClient()
+        self.data = type("Data", (), {"options": options})
+
+
+SCENARIOS = {
+    "plain options (5)": (plain, [
+        Option("name", type=3, value="item"),
+        Option("amount", type=4, value=5),
+        Option("flag", type=5, value=True),
+        Option("ratio", type=10, value=0.5),
+        Option("reason", type=3, value="because")
+    ]),
+    "entity options (3 + 2)": (entities, [
+        Option("user", type=6, value="80088516616269824"),
+        Option("channel", type=7, value="381870553235193857"),
+        Option("role", type=8, value="381870553235193858"),
+        Option("name", type=3, value="item"),
+        Option("amount", type=4, value=5)
+    ])
+}
+
+
+async def measure(make, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await make()
+    return time.perf_counter() - start
+
+
+def main(number: int = 100000):
+    loop = asyncio.new_event_loop()
+    for label, (callback, options) in SCENARIOS.items():
+        command = FakeCommand(callback)
+        binder = ArgumentBinder(command.params, options)
+        ctx = FakeContext(command, options)
+
+        legacy = loop.run_until_complete(legacy_bind(ctx, command))
+        bound = loop.run_until_complete(binder.bind(ctx, None, options))
+        assert legacy == bound, (legacy, bound)
+
+        results = []
+        for name, make in (("legacy", lambda: legacy_bind(ctx, command)),
+                           ("binder", lambda: binder.bind(ctx, None, options))):
+            total = loop.run_until_complete(measure(make, number))
+            results.append(f"{name} {total / number * 1e6:.2f} us")
+        print(f"{label}: {', '.join(results)}")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
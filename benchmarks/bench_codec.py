@@ -0,0 +1,91 @@
+"""Encoding and decoding cost of interaction payloads per json codec, on
+embed- and component-heavy responses.
+
+``aiohttp`` (the path before :mod:`slash.codec`) is ``json.dumps`` with the
+default separators followed by the utf-8 encode aiohttp does for ``json=``.
+
+Run with the package installed, and orjson to compare it:
+``python benchmarks/bench_codec.py``.
+"""
+import json
+import time
+
+from slash.codec import OrjsonCodec, StdlibCodec, orjson
+
+
+def embed(i: int) -> dict:
+    return {
+        "title": f"Leaderboard page {i}",
+        "description": "Top players of the season, updated every hour. " * 8,
+        "color": 0x5865F2,
+        "timestamp": "2021-09-01T12:00:00+00:00",
+        "author": {"name": "Season 7", "icon_url": "https://cdn.discordapp.com/icons/1/a.png"},
+        "footer": {"text": f"Page {i} of 10 • ranked by points"},
+        "thumbnail": {"url": "https://cdn.discordapp.com/avatars/1/b.png"},
+        "fields": [
+            {"name": f"#{n} Pläyer {n}", "value": f"{1000 - n} points • {n % 7} wins", "inline": True}
+            for n in range(25)
+        ]
+    }
+
+
+def components() -> list:
+    rows = [{
+        "type": 1,
+        "components": [
+            {"type": 2, "style": 1 + (b % 4), "label": f"Option {r}-{b}",
+             "custom_id": f"vote:{123456789 + r}:{b}", "emoji": {"name": "⭐"}}
+            for b in range(5)
+        ]
+    } for r in range(4)]
+    rows.append({
+        "type": 1,
+        "components": [{
+            "type": 3,
+            "custom_id": "page:select",
+            "placeholder": "Jump to a page",
+            "options": [{"label": f"Page {n}", "value": str(n), "description": f"Players {n * 25} to {n * 25 + 24}"}
+                        for n in range(25)]
+        }]
+    })
+    return rows
+
+
+def payloads() -> dict:
+    return {
+        "reply": {"type": 4, "data": {"content": "Here you go", "embeds": [embed(1)], "components": components()}},
+        "embeds": {"content": None, "embeds": [embed(i) for i in range(10)]},
+        "components": {"content": "Vote!", "components": components()}
+    }
+
+
+def measure(func, arg, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func(arg)
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def main(number: int = 2000):
+    codecs = {"aiohttp": None, "stdlib": StdlibCodec()}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec()
+    else:
+        print("orjson is not installed, only the standard library is measured")
+
+    for label, payload in payloads().items():
+        raw = StdlibCodec().dumps(payload)
+        print(f"{label} ({len(raw)} bytes)")
+        for name, codec in codecs.items():
+            if codec is None:
+                dumps = lambda obj: json.dumps(obj).encode("utf-8")
+                loads = json.loads
+            else:
+                dumps, loads = codec.dumps, codec.loads
+                assert loads(dumps(payload)) == payload
+            print(f"  {name:8} dumps {measure(dumps, payload, number):8.2f} us"
+                  f"  loads {measure(loads, raw, number):8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
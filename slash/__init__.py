@@ -4,3 +4,18 @@ __version__ = "1.0.0"
 from .client import *
 from .models import *
 from .enums import *
+from .cache import *
+from .dispatch import *
+from .cooldowns import *
+from .sync import *
+from .registry import *
+from .resolver import *
+from .views import *
+from .components import *
+from .state import *
+from .autocomplete import *
+from .choices import *
+from .http import *
+from .codec import *
+from .responses import *
+from .editor import *
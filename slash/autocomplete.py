@@ -0,0 +1,168 @@
+import asyncio
+
+from .cache import TTLCache
+from .choices import ChoiceProvider
+
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+__all__ = ("Autocompleter",)
+
+# discord shows at most this many suggestions
+MAX_CHOICES = 25
+
+
+def _focused(options: List[dict], path: Tuple[str, ...] = ()) -> Optional[Tuple[Tuple[str, ...], dict]]:
+    for option in options:
+        if option.get("focused"):
+            return path, option
+        if option.get("options"):
+            found = _focused(option["options"], path + (option["name"],))
+            if found is not None:
+                return found
+    return None
+
+
+def _choice(choice: Any) -> dict:
+    if isinstance(choice, dict):
+        return choice
+    if isinstance(choice, tuple):
+        return {"name": str(choice[0]), "value": choice[1]}
+    if hasattr(choice, "to_dict"):
+        return choice.to_dict()
+    return {"name": str(choice), "value": choice}
+
+
+class Autocompleter:
+    """Answers the autocomplete interactions of options with an ``autocomplete`` handler
+
+    Suggestions are cached per guild, command, option and typed value. Requests of
+    one user for the same option wait ``debounce`` seconds first and only the
+    latest one runs the handler, so a fast typist triggers one query per
+    pause instead of one per keystroke. Requests for the same value share one
+    running handler. Whatever happens, a response is sent within ``budget``
+    seconds of receiving the interaction, an empty one if the handler is too
+    slow, its result is still cached for the next request.
+
+    Parameters
+    ------------
+    client: :class:`~slash.client.SlashClient`
+        The slashclient
+    cache_size: :class:`~int`
+        Number of cached suggestion lists, defaults to 4096
+    ttl: Optional[:class:`~float`]
+        Seconds suggestions are cached, defaults to 30
+    debounce: :class:`~float`
+        Seconds a request waits for a newer one of the same user, defaults to 0.15
+    budget: :class:`~float`
+        Seconds after which an empty response is sent, leaves room for the
+        request within discord's 3 seconds, defaults to 2.5
+
+    **Attributes**
+
+    Attributes
+    ------------
+    cache: :class:`~slash.cache.TTLCache`
+        The cached suggestions
+    counters: :class:`~collections.Counter`
+        Number of requests keyed by ``"provider"`` (answered by a
+        :class:`~slash.choices.ChoiceProvider`), ``"cached"``, ``"handled"``, ``"shared"``
+        (waited for a running handler), ``"superseded"`` (skipped for a newer
+        one), ``"timeout"`` and ``"error"``
+    """
+    def __init__(self,
+                 client,
+                 cache_size: int = 4096,
+                 ttl: Optional[float] = 30.0,
+                 debounce: float = 0.15,
+                 budget: float = 2.5) -> None:
+        self.client = client
+        self.cache: TTLCache = TTLCache(cache_size, ttl)
+        self.debounce = debounce
+        self.budget = budget
+        self.counters: Counter = Counter()
+        self._latest: Dict[Hashable, int] = {}
+        self._running: Dict[Hashable, asyncio.Future] = {}
+
+    def __repr__(self):
+        return f"<Autocompleter cached={len(self.cache)} running={len(self._running)}>"
+
+    async def handle(self, interaction, command):
+        """Answers an autocomplete interaction of a command"""
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self.budget
+
+        data = interaction.data
+        found = _focused(data.get("options") or [])
+        if found is None:
+            return
+        path, focused = found
+        target = command._routes.get(path, command) if path else command
+        option = next((o for o in target.options
+                       if getattr(o, "name", None) == focused["name"]), None)
+        if option is None or getattr(option, "autocomplete", None) is None:
+            return
+
+        value = str(focused.get("value", ""))
+        if isinstance(option.autocomplete, ChoiceProvider):
+            # an index lookup is cheaper than the cache and needs no debounce
+            self.counters["provider"] += 1
+            return await self._respond(interaction, [c.to_dict() for c in option.autocomplete.search(value)])
+
+        # global commands answer every guild, suggestions of one are not those of another
+        key = (interaction.guild_id, int(data["id"]), path, option.name, value)
+        if option.cache_choices:
+            choices = self.cache.get(key)
+            if choices is not None:
+                self.counters["cached"] += 1
+                return await self._respond(interaction, choices)
+
+        user = (interaction.user.id, int(data["id"]), path, option.name)
+        seq = self._latest[user] = self._latest.get(user, 0) + 1
+        await asyncio.sleep(self.debounce)
+        if self._latest.get(user) != seq:
+            # discord only shows the suggestions of the latest request
+            self.counters["superseded"] += 1
+            return
+        del self._latest[user]
+
+        running = self._running.get(key)
+        if running is not None:
+            self.counters["shared"] += 1
+        else:
+            running = self._running[key] = loop.create_task(self._run(option, interaction, value, key))
+            self.counters["handled"] += 1
+
+        try:
+            choices = await asyncio.wait_for(asyncio.shield(running), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.counters["timeout"] += 1
+            choices = []
+        await self._respond(interaction, choices)
+
+    async def _run(self, option, interaction, value: str, key: Hashable) -> List[dict]:
+        try:
+            result = await option.autocomplete(interaction, value)
+            choices = [_choice(c) for c in (result or [])][:MAX_CHOICES]
+            if option.cache_choices:
+                self.cache.set(key, choices)
+            return choices
+        except Exception:
+            self.counters["error"] += 1
+            await self.client.bot.on_error("on_interaction", interaction)
+            return []
+        finally:
+            self._running.pop(key, None)
+
+    async def _respond(self, interaction, choices: List[dict]):
+        await self.client.interaction_http.callback(
+            interaction.id, interaction.token, {"type": 8, "data": {"choices": choices}})
+
+    def stats(self) -> Dict[str, Any]:
+        """Gives the counters and the cache stats"""
+        return {
+            **self.counters,
+            "running": len(self._running),
+            "cache": self.cache.stats()
+        }
@@ -0,0 +1,135 @@
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+
+__all__ = ("TTLCache",)
+
+
+class TTLCache:
+    """A bounded mapping which evicts the least recently used entry when
+    full and drops entries older than their time to live
+
+    Parameters
+    ------------
+    maxsize: :class:`~int`
+        Maximum number of entries, defaults to 1024
+    ttl: Optional[:class:`~float`]
+        Seconds an entry lives, None to keep entries until they are evicted, defaults to None
+
+    **Attributes**
+
+    Attributes
+    ------------
+    hits: :class:`~int`
+        Number of lookups which found a live entry
+    misses: :class:`~int`
+        Number of lookups which found nothing or an expired entry
+    evictions: :class:`~int`
+        Number of entries dropped because the cache was full
+    """
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: 'OrderedDict[Hashable, Tuple[Optional[float], Any]]' = OrderedDict()
+
+    def __repr__(self):
+        return f"<TTLCache size={len(self._data)} maxsize={self.maxsize} ttl={self.ttl} hits={self.hits} misses={self.misses}>"
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._data))
+
+    @staticmethod
+    def _expired(entry: Tuple[Optional[float], Any]) -> bool:
+        return entry[0] is not None and entry[0] <= time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Gives the value of a key and marks it as recently used"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._expired(entry):
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Same as :meth:`get` but neither counts nor marks the key as used"""
+        entry = self._data.get(key)
+        if entry is None or self._expired(entry):
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = -1.0):
+        """Stores a value, evicting the least recently used entry if full
+
+        Parameters
+        ------------
+        key: Hashable
+            The key
+        value: Any
+            The value
+        ttl: Optional[:class:`~float`]
+            Overrides the time to live of the cache for this entry, None
+            keeps it until evicted, a negative value uses the cache ttl"""
+        if ttl is not None and ttl < 0:
+            ttl = self.ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes a key and gives its value"""
+        entry = self._data.pop(key, None)
+        if entry is None or self._expired(entry):
+            return default
+        return entry[1]
+
+    def expire(self) -> int:
+        """Drops every expired entry
+
+        Returns
+        --------
+        :class:`~int`
+            Number of dropped entries"""
+        now = time.monotonic()
+        dead = [k for k, (expires, _) in self._data.items() if expires is not None and expires <= now]
+        for key in dead:
+            del self._data[key]
+        return len(dead)
+
+    def clear(self):
+        """Removes every entry"""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Gives the size and hit/miss counters of the cache"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
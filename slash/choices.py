@@ -0,0 +1,167 @@
+import re
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from .models import Choice
+from .exceptions import BadChoice
+
+
+__all__ = ("ChoiceProvider",)
+
+T = TypeVar("T")
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+class ChoiceProvider(Generic[T]):
+    """Suggests the choices of an option from any number of entries, used as
+    the ``autocomplete`` handler of an :class:`~slash.models.Option`
+
+    Names are indexed case-insensitively in sorted arrays, a lookup is a
+    binary search followed by a walk over the matches, so it takes
+    microseconds for hundreds of thousands of entries. Matches of the start
+    of the name come first, then matches of the start of any other word (split on spaces and punctuation),
+    then, if there is still room, names which start with the value after
+    fixing one typo (an extra or two swapped characters).
+
+    The value of the submitted option is mapped back to its entry in
+    constant time, the callback gets the entry itself. Discord lets users
+    submit any text, the command is rejected with
+    :exc:`~slash.exceptions.BadChoice` then, like a command on cooldown.
+
+    Parameters
+    ------------
+    entries: Iterable[Any]
+        The backing objects
+    name: Callable[[Any], :class:`~str`]
+        Gives the shown name of an entry, defaults to :func:`str`
+    value: Optional[Callable[[Any], Union[:class:`~str`, :class:`~int`, :class:`~float`]]]
+        Gives the value sent back by discord, it has to be unique, defaults to the name
+    limit: :class:`~int`
+        Number of suggestions, discord shows at most 25, defaults to 25
+    fuzzy: :class:`~bool`
+        Whether values with a typo are matched too, defaults to True
+
+    Raises
+    -------
+    ValueError
+        Two entries have the same value
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        import zoneinfo
+
+        zones = ChoiceProvider(sorted(zoneinfo.available_timezones()))
+
+        @slash.command(name="time", description="Shows the time of a timezone",
+                       options=[Option("zone", autocomplete=zones)])
+        async def time(ctx, zone):
+            ...
+    """
+    def __init__(self,
+                 entries: Iterable[T],
+                 name: Callable[[T], str] = str,
+                 value: Optional[Callable[[T], Any]] = None,
+                 limit: int = 25,
+                 fuzzy: bool = True) -> None:
+        self.limit = limit
+        self.fuzzy = fuzzy
+        self._entries: List[T] = list(entries)
+        self._names: List[str] = [name(e) for e in self._entries]
+        self._values: List[Any] = [value(e) for e in self._entries] if value else self._names
+
+        self._by_value: Dict[Any, int] = {}
+        for i, v in enumerate(self._values):
+            if v in self._by_value:
+                raise ValueError(f"Duplicate choice value '{v}'")
+            self._by_value[v] = i
+
+        # whole names and every later word, each sorted with the entry it belongs to
+        names = sorted((n.casefold(), i) for i, n in enumerate(self._names))
+        self._keys: List[str] = [k for k, _ in names]
+        self._order = array("l", (i for _, i in names))
+
+        words = sorted((w, i) for i, n in enumerate(self._names) for w in _WORD.findall(n.casefold())[1:])
+        self._words: List[str] = [w for w, _ in words]
+        self._word_order = array("l", (i for _, i in words))
+
+    def __repr__(self):
+        return f"<ChoiceProvider entries={len(self._entries)} limit={self.limit}>"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._entries)
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._by_value
+
+    def get(self, value: Any, default: Optional[T] = None) -> Optional[T]:
+        """Gives the entry of a value"""
+        i = self._by_value.get(value)
+        return self._entries[i] if i is not None else default
+
+    @staticmethod
+    def _scan(keys: List[str], order: array, prefix: str, limit: int, seen: Dict[int, None]):
+        start = bisect_left(keys, prefix)
+        for pos in range(start, len(keys)):
+            if len(seen) >= limit or not keys[pos].startswith(prefix):
+                return
+            seen.setdefault(order[pos])
+
+    @staticmethod
+    def _typos(prefix: str) -> Iterator[str]:
+        # one binary search per variant instead of scoring every name
+        for i in range(len(prefix) - 1):
+            yield prefix[:i] + prefix[i + 1] + prefix[i] + prefix[i + 2:]
+        for i in range(len(prefix)):
+            yield prefix[:i] + prefix[i + 1:]
+
+    def search(self, value: str, limit: Optional[int] = None) -> List[Choice]:
+        """Gives the choices whose name or one of its words starts with a value
+
+        Parameters
+        ------------
+        value: :class:`~str`
+            The typed value, an empty one gives the first names
+        limit: Optional[:class:`~int`]
+            Overrides the number of choices
+
+        Returns
+        --------
+        List[:class:`~slash.models.Choice`]
+            The choices, matches of the whole name first"""
+        limit = limit or self.limit
+        prefix = value.strip().casefold()
+        # a dict keeps the order and drops entries matched by both indexes
+        seen: Dict[int, None] = {}
+        self._scan(self._keys, self._order, prefix, limit, seen)
+        if prefix and len(seen) < limit:
+            self._scan(self._words, self._word_order, prefix, limit, seen)
+        if self.fuzzy and len(prefix) > 2 and len(seen) < limit:
+            for variant in self._typos(prefix):
+                self._scan(self._keys, self._order, variant, limit, seen)
+        return [self._choice(i) for i in seen]
+
+    def _choice(self, i: int) -> Choice:
+        choice = Choice(self._names[i])
+        # Choice falls back to the name for any falsy value, 0 or "" included
+        choice.value = self._values[i]
+        return choice
+
+    def _convert(self, ctx, value: Any) -> T:
+        # used by ArgumentBinder for the options this provider completes, discord
+        # lets users send any text in an autocompleted option
+        i = self._by_value.get(value)
+        if i is None:
+            raise BadChoice(self, value)
+        return self._entries[i]
+
+    async def __call__(self, interaction, value: str) -> List[Choice]:
+        return self.search(value)
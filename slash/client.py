@@ -1,15 +1,28 @@
 import discord
+import asyncio
+import functools
 import importlib
 import sys
 
+from collections import Counter
 from .exceptions import *
 from .types import StoredCommand
+from .cache import TTLCache
+from .dispatch import Dispatcher
+from .registry import CommandRegistry
+from .views import ViewStore
+from .components import ComponentHandler, ComponentRouter
+from .state import MemoryStateStore, StateStore
+from .autocomplete import Autocompleter
+from .http import InteractionHTTP
+from .codec import JSONCodec, default_codec
+from .sync import CommandManifest, ScopeDiff, SyncReport, scope_hash
 from .models import InteractionContext, SlashCommand, command as _cmd
 
 from discord import http, ui
 from discord.ext import commands
 from discord.enums import InteractionType
-from typing import List, Optional, Tuple, Union, Dict
+from typing import Callable, List, Mapping, Optional, Set, Tuple, Union, Dict
 
 
 class Bot(commands.Bot):
@@ -20,6 +33,8 @@ class Bot(commands.Bot):
     ------------
     slashlog: :class:`~bool`
         Whether to log slashactions, defaults to False
+    slashmanifest: Optional[:class:`~str`]
+        Path of the command manifest, see :class:`~slash.client.SlashClient`
 
     Example
     ---------
@@ -34,7 +49,13 @@ class Bot(commands.Bot):
     def __init__(self, **options):
         """Constructor"""
         super().__init__(**options)
-        self.slashclient = SlashClient(self, logging = True if options.get("slashlog") else False)
+        self.slashclient = SlashClient(self, logging = True if options.get("slashlog") else False,
+                                       manifest = options.get("slashmanifest"))
+
+    async def close(self):
+        """Closes the slashclient and the bot"""
+        await self.slashclient.close()
+        await super().close()
 
     def slash(self, *args, **kwargs) -> SlashCommand:
         """Adds a command to bot
@@ -82,6 +103,8 @@ class AutoShardedBot(commands.AutoShardedBot):
     ------------
     slashlog: :class:`~bool`
         Whether to log slashactions, defaults to False
+    slashmanifest: Optional[:class:`~str`]
+        Path of the command manifest, see :class:`~slash.client.SlashClient`
 
     Example
     ---------
@@ -96,7 +119,13 @@ class AutoShardedBot(commands.AutoShardedBot):
     def __init__(self, **options):
         """Constructor"""
         super().__init__(**options)
-        self.slashclient = SlashClient(self, logging = True if options.get("slashlog") else False)
+        self.slashclient = SlashClient(self, logging = True if options.get("slashlog") else False,
+                                       manifest = options.get("slashmanifest"))
+
+    async def close(self):
+        """Closes the slashclient and the bot"""
+        await self.slashclient.close()
+        await super().close()
 
     def slash(self, *args, **kwargs) -> SlashCommand:
         """Adds a command to bot
@@ -147,6 +176,86 @@ class SlashClient:
         Your dpy bot
     logging: :class:`~bool`
         prints all the logs of this module, defaults to False
+    manifest: Optional[:class:`~str`]
+        Path of a json file where the hash and ids of every synced scope are
+        stored, scopes whose commands did not change are not synced again
+        on the next start, (optional)
+    warm_routing: :class:`~bool`
+        Whether interactions of commands which are not synced yet are routed
+        by the ids of the manifest or by their name and guild, defaults to True
+    entity_cache_size: :class:`~int`
+        Maximum number of members, users and channels fetched over REST which
+        are kept for later interactions, defaults to 10000
+    entity_cache_ttl: Optional[:class:`~float`]
+        Seconds a fetched entity is kept, defaults to 300. Fetched threads
+        and channels are dropped when they are updated or deleted and
+        members when they leave, other changes of a fetched entity are seen
+        once it expired. The entities discord sends with an interaction are
+        always preferred
+    auto_defer: Optional[:class:`~float`]
+        Seconds after which an interaction is deferred if its callback has not
+        responded yet, ``ctx.reply`` then edits the deferred response, 2.2 leaves
+        room for the request within discord's 3 seconds, None disables it,
+        defaults to None
+    dispatcher: Optional[:class:`~slash.dispatch.Dispatcher`]
+        Runs the command callbacks on a bounded pool of workers, a
+        :class:`~slash.dispatch.FairDispatcher` also shares them fairly
+        between guilds, callbacks run inline in the interaction listener
+        if None, defaults to None
+    view_store_size: :class:`~int`
+        Maximum number of views whose components are routed, the least
+        recently used one is dropped when full, defaults to 5000
+    view_ttl: Optional[:class:`~float`]
+        Seconds without being used after which a view without timeout is
+        dropped, None keeps them until evicted, defaults to None
+    state_store: Optional[:class:`~slash.state.StateStore`]
+        Where the states saved with :meth:`save_view` are kept, a
+        :class:`~slash.state.SQLiteStateStore` keeps them across restarts and
+        shard processes, defaults to a :class:`~slash.state.MemoryStateStore`
+    autocomplete_ttl: Optional[:class:`~float`]
+        Seconds the suggestions of an autocomplete handler are cached for a
+        typed value, defaults to 30
+    autocomplete_debounce: :class:`~float`
+        Seconds an autocomplete request waits for a newer one of the same user
+        before its handler runs, defaults to 0.15
+    interaction_http: Optional[:class:`~slash.http.InteractionHTTP`]
+        Sends the responses of interactions, give one to tune its connection
+        pool and timeouts, (optional)
+    codec: Optional[:class:`~slash.codec.JSONCodec`]
+        Encodes the bodies and decodes the responses of :attr:`interaction_http`,
+        defaults to orjson if it is installed and the standard library otherwise
+
+    **Attributes**
+
+    Attributes
+    ------------
+    routing_stats: :class:`~collections.Counter`
+        Number of interactions routed by the fallbacks of ``warm_routing``,
+        keyed by ``"manifest"``, ``"name"`` and ``"miss"``
+    resolve_stats: :class:`~collections.Counter`
+        How user, channel and role options were resolved, keyed by
+        ``"cache"``, ``"resolved"``, ``"rest"`` (a REST fallback) and
+        ``"gateway"`` (a batched member request)
+    entity_cache: :class:`~slash.cache.TTLCache`
+        The fetched members, users and channels keyed by (guild id, id),
+        see :meth:`~slash.cache.TTLCache.stats` for its hits and misses
+    deadline_misses: :class:`~collections.Counter`
+        Number of interactions deferred by ``auto_defer``, keyed by command name
+    views: :class:`~slash.views.ViewStore`
+        The sent views, see :meth:`~slash.views.ViewStore.stats` for its size
+        and the number of unknown custom ids
+    components: :class:`~slash.components.ComponentRouter`
+        The persistent component handlers added with :meth:`component`
+    autocompleter: :class:`~slash.autocomplete.Autocompleter`
+        Answers autocomplete interactions, see :meth:`~slash.autocomplete.Autocompleter.stats`
+    interaction_http: :class:`~slash.http.InteractionHTTP`
+        Sends the responses of interactions with discord's rate limits,
+        see :meth:`~slash.http.InteractionHTTP.stats`
+
+    Interactions rejected by the cooldown or max concurrency of a command, or
+    by a :class:`~slash.choices.ChoiceProvider` which does not know the value,
+    dispatch ``on_slash_command_error(ctx, error)`` if the bot listens to it,
+    else the error is sent as an ephemeral reply.
     
     Raises
     -------
@@ -155,16 +264,56 @@ class SlashClient:
     """
     def __init__(self,
                  bot: Union[commands.Bot, commands.AutoShardedBot],
-                 logging: bool = False):
+                 logging: bool = False,
+                 manifest: Optional[str] = None,
+                 warm_routing: bool = True,
+                 entity_cache_size: int = 10000,
+                 entity_cache_ttl: Optional[float] = 300.0,
+                 auto_defer: Optional[float] = None,
+                 dispatcher: Optional[Dispatcher] = None,
+                 view_store_size: int = 5000,
+                 view_ttl: Optional[float] = None,
+                 state_store: Optional[StateStore] = None,
+                 autocomplete_ttl: Optional[float] = 30.0,
+                 autocomplete_debounce: float = 0.15,
+                 interaction_http: Optional[InteractionHTTP] = None,
+                 codec: Optional[JSONCodec] = None):
         self.bot: commands.Bot = bot
         if hasattr(bot, "slashclient"):
             raise ValueError(
                 "Bot has already a slashclient registered with this module")
         self.bot.slashclient = self
         self.logging: bool = logging
-        self._views: Dict[str, Tuple[ui.View, ui.Item]] = {}
-        self.__commands = {}
+        self.views: ViewStore = ViewStore(view_store_size, view_ttl)
+        self.components: ComponentRouter = ComponentRouter()
+        self.state_store: StateStore = state_store or MemoryStateStore()
+        self._view_factories: Dict[str, Callable] = {}
+        self.codec: JSONCodec = codec or default_codec()
+        self.interaction_http: InteractionHTTP = interaction_http or InteractionHTTP()
+        self.interaction_http.client = self
+        self.autocompleter: Autocompleter = Autocompleter(self, ttl=autocomplete_ttl,
+                                                          debounce=autocomplete_debounce)
+        self.registry: CommandRegistry = CommandRegistry()
+        self._dirty_scopes = set()
+        self._sync_task: Optional[asyncio.Task] = None
+        self.manifest: Optional[CommandManifest] = CommandManifest(manifest) if manifest else None
+        self.warm_routing: bool = warm_routing
+        self.routing_stats: Counter = Counter()
+        self.resolve_stats: Counter = Counter()
+        self.entity_cache: TTLCache = TTLCache(entity_cache_size, entity_cache_ttl)
+        self.auto_defer: Optional[float] = auto_defer
+        self.deadline_misses: Counter = Counter()
+        self._deferring: Set[asyncio.Task] = set()
+        self.dispatcher: Optional[Dispatcher] = dispatcher
+        self._warm_ids: Dict[int, Tuple[Optional[int], str]] = self.manifest.routes() if self.manifest else {}
         self.bot.add_listener(self.socket_resp, "on_interaction")
+        self.bot.add_listener(self._invalidate_member, "on_raw_member_remove")
+        self.bot.add_listener(self._invalidate_channel, "on_guild_channel_update")
+        self.bot.add_listener(self._invalidate_channel, "on_guild_channel_delete")
+        self.bot.add_listener(self._invalidate_thread, "on_raw_thread_update")
+        self.bot.add_listener(self._invalidate_thread, "on_raw_thread_delete")
+        self.bot.add_listener(self._forget_message, "on_raw_message_delete")
+        self.bot.add_listener(self._forget_messages, "on_raw_bulk_message_delete")
 
     @property
     def commands(self) -> Dict[int, StoredCommand]:
@@ -174,7 +323,7 @@ class SlashClient:
         ---------
         Dict[:class:`~int`, :class:`~slash.types.StoredCommand`]
           The json of commands."""
-        return self.__commands
+        return self.registry.by_id
 
     def command(self, *args, cls=discord.utils.MISSING, **kwargs) -> SlashCommand:
         """Adds a command to bot
@@ -189,6 +338,10 @@ class SlashClient:
             the options for command, can be empty
         cls: :class:`~slash.models.SlashCommand`
             The custom command class, must be a subclass of :class:`~slash.models.SlashCommand`, (optional)
+        cooldown: Optional[:class:`~slash.cooldowns.Cooldown`]
+            Rate limit of the command, (optional)
+        max_concurrency: Optional[:class:`~slash.cooldowns.MaxConcurrency`]
+            How many times the command can run at once, (optional)
 
         Example
         ---------
@@ -225,6 +378,172 @@ class SlashClient:
 
         return decorator
 
+    def component(self, template: str, *, prefix: bool = False) -> ComponentHandler:
+        """Adds a persistent handler of every component whose custom id matches a template
+
+        The handler is not bound to a message or view, so it keeps working for
+        old messages after a restart.
+
+        Parameters
+        -----------
+        template: :class:`~str`
+            The custom id template, fields are written as ``{name}`` or
+            ``{name:int}`` and passed to the callback as keyword arguments
+        prefix: :class:`~bool`
+            Whether custom ids may continue after the template, defaults to False
+
+        Example
+        ---------
+
+        .. code-block:: python3
+
+            @slash.component("vote:{poll_id:int}:{option}")
+            async def vote(interaction, poll_id, option):
+                await interaction.response.send_message(f"Voted {option}", ephemeral=True)
+
+        Raises
+        --------
+        ValueError
+           The template is invalid or already has a handler
+
+        Returns
+        --------
+        :class:`~slash.components.ComponentHandler`
+            The handler.
+        """
+        def decorator(func):
+            handler = ComponentHandler(template, func, prefix)
+            self.components.add(handler)
+            return handler
+
+        return decorator
+
+    def view_factory(self, name: str):
+        """Adds a function which rebuilds a view from the state saved with :meth:`save_view`
+
+        Components of views which are not in this process anymore, because it
+        restarted or the interaction reached another shard process, are
+        routed to a view rebuilt by its factory.
+
+        Parameters
+        -----------
+        name: :class:`~str`
+            The name of the factory
+
+        Example
+        ---------
+
+        .. code-block:: python3
+
+            @slash.view_factory("counter")
+            def counter(state):
+                return CounterView(count=state["count"])
+
+            @slash.command(name="counter", description="Counts clicks")
+            async def start(ctx):
+                view = CounterView(count=0)
+                message = await ctx.reply("Click it", view=view)
+                await slash.save_view("counter", view, {"count": 0}, message=message)
+        """
+        def decorator(func):
+            self._view_factories[name] = func
+            return func
+
+        return decorator
+
+    async def save_view(self, name: str, view: ui.View, state: dict, ttl: Optional[float] = None, *,
+                        message: Union[discord.Message, int]):
+        """Saves the state of a view sent with a message in the
+        :attr:`state_store`, save it again when the state changes
+
+        The state is saved per message, so messages sharing the custom ids
+        of a view keep their own state.
+
+        Parameters
+        -----------
+        name: :class:`~str`
+            The name of the factory which rebuilds the view
+        view: :class:`~discord.ui.View`
+            The view, only its items with a custom id are routed
+        state: :class:`~dict`
+            The json serialisable state passed to the factory
+        ttl: Optional[:class:`~float`]
+            Seconds the state is kept, None keeps it forever, defaults to None
+        message: Union[:class:`~discord.Message`, :class:`~int`]
+            The message the view was sent with, or its id
+
+        Raises
+        --------
+        ValueError
+            There is no factory with that name, or no item of the view has
+            an explicitly given custom id
+        TypeError
+            The state is not json serialisable"""
+        if name not in self._view_factories:
+            raise ValueError(f"View factory '{name}' does not exist!")
+
+        ids = [item.custom_id for item in view.children if getattr(item, "_provided_custom_id", False)]
+        if not ids:
+            raise ValueError("The view has no item with an explicitly given custom_id, nothing could be routed to it")
+
+        message_id = getattr(message, "id", message)
+        record = {"view": name, "state": state}
+        for custom_id in ids:
+            await self.state_store.set(f"{message_id}:{custom_id}", record, ttl)
+
+    async def _restore_view(self, custom_id: str, message: Optional[discord.Message]):
+        if message is None:
+            return None
+        record = await self.state_store.get(f"{message.id}:{custom_id}")
+        if record is None or record["view"] not in self._view_factories:
+            return None
+
+        view = self._view_factories[record["view"]](record["state"])
+        if asyncio.iscoroutine(view):
+            view = await view
+        self.views.add(view, message.id)
+        return self.views.get(custom_id)
+
+    async def _invalidate_member(self, payload: discord.RawMemberRemoveEvent):
+        # member updates only fire for members discord.py caches, which are never
+        # in the entity cache, the removal is the one raw event about the others
+        self.entity_cache.pop((payload.guild_id, payload.user.id))
+
+    async def _invalidate_channel(self, *channels: discord.abc.GuildChannel):
+        channel = channels[-1]
+        self.entity_cache.pop((channel.guild.id, channel.id))
+
+    async def _invalidate_thread(self, payload: Union[discord.RawThreadUpdateEvent, discord.RawThreadDeleteEvent]):
+        # threads are never in guild.get_channel nor resolved, so they are always fetched,
+        # the raw events fire for the uncached ones too
+        self.entity_cache.pop((payload.guild_id, payload.thread_id))
+
+    async def _forget_message(self, payload: discord.RawMessageDeleteEvent):
+        self.views.remove_message(payload.message_id)
+
+    async def _forget_messages(self, payload: discord.RawBulkMessageDeleteEvent):
+        for message_id in payload.message_ids:
+            self.views.remove_message(message_id)
+
+    async def close(self, timeout: Optional[float] = 10.0):
+        """Lets the :attr:`dispatcher` finish the queued interactions and
+        stops its workers, then closes the session of :attr:`interaction_http`
+        and flushes the :attr:`state_store`, called by :meth:`Bot.close`
+
+        Parameters
+        -----------
+        timeout: Optional[:class:`~float`]
+            Seconds the queued interactions are waited for before the
+            remaining ones are cancelled, None waits for all, defaults to 10"""
+        if self.dispatcher is not None:
+            try:
+                await asyncio.wait_for(self.dispatcher.join(), timeout)
+            except asyncio.TimeoutError:
+                self.log(f"Dispatcher did not finish in {timeout}s, cancelling {self.dispatcher.depth} queued interactions")
+            await self.dispatcher.close()
+        await self.interaction_http.close()
+        await self.state_store.close()
+
     def log(self, message: str):
         """Logs the works
         
@@ -235,23 +554,184 @@ class SlashClient:
         if self.logging:
             print(message)
 
+    def _route(self, data: dict) -> Optional[SlashCommand]:
+        _id = int(data['id'])
+        command = self.registry.get_by_id(_id)
+        if command is not None:
+            return command
+        if not self.warm_routing:
+            return None
+
+        if _id in self._warm_ids:
+            guild, name = self._warm_ids[_id]
+            command = self.registry.get(name, guild)
+            if command is not None:
+                self.routing_stats["manifest"] += 1
+                return command
+
+        guild = int(data['guild_id']) if data.get('guild_id') else None
+        command = self.registry.get(data['name'], guild)
+        if command is not None:
+            self.routing_stats["name"] += 1
+            return command
+
+        self.routing_stats["miss"] += 1
+        self.log(f"Interaction for unknown command '{data['name']}' (ID: {_id}) dropped")
+
     async def socket_resp(self, interaction):
         if interaction.type == InteractionType.application_command:
-            if int(interaction.data['id']) in self.__commands:
-                command = self.__commands[int(interaction.data['id'])]
-                context = await InteractionContext(
-                    self.bot, self).from_interaction(interaction)
-
-                await (command['command']).callback(**context.kwargs)
+            command = self._route(interaction.data)
+            if command is not None:
+                context = InteractionContext(self.bot, self)._prepare(interaction, command)
+                budget = self.auto_defer if command.auto_defer is None else command.auto_defer
+                watchdog = None
+                if budget:
+                    watchdog = self.bot.loop.call_later(budget, self._deadline_missed, command, context)
+
+                try:
+                    slot = await self._acquire_limits(command, interaction)
+                except (CommandOnCooldown, MaxConcurrencyReached) as error:
+                    self._release(command, watchdog)
+                    await self._command_error(context, error)
+                    return
+
+                job = functools.partial(self._invoke, context, interaction, watchdog, slot)
+                if self.dispatcher is None:
+                    await job()
+                elif not await self.dispatcher.submit(job, functools.partial(self._reject_busy, context),
+                                                      key=interaction.guild_id,
+                                                      on_error=functools.partial(self._job_error, interaction)):
+                    self._release(command, watchdog, slot)
+                    if command.cooldown is not None:
+                        command.cooldown.refund(interaction)
+
+        elif interaction.type == InteractionType.autocomplete:
+            # answered inline, a queued suggestion would come too late to be useful
+            command = self._route(interaction.data)
+            if command is not None:
+                await self.autocompleter.handle(interaction, command)
 
         elif interaction.type == InteractionType.component:
             interactctx = interaction
             custom_id = interactctx.data['custom_id']
 
-            view, item = self._views[custom_id]
+            # views of single messages first, then the persistent handlers
+            message_id = interactctx.message.id if interactctx.message is not None else None
+            found = self.views.get(custom_id, message_id)
+            if found is not None:
+                view, item = found
+                if message_id is not None:
+                    self.views.bind(view, message_id)
+
+                self._dispatch_view(view, item, interactctx)
+                return
+
+            matched = self.components.match(custom_id)
+            if matched is None:
+                found = await self._restore_view(custom_id, interactctx.message)
+                if found is None:
+                    # counted only now, the handlers and the restored views serve the others
+                    self.views.unknown += 1
+                    self.log(f"Unknown component - {custom_id}")
+                    return
+
+                view, item = found
+                self._dispatch_view(view, item, interactctx)
+                return
+
+            handler, fields = matched
+            await handler.callback(interactctx, **fields)
+
+    @staticmethod
+    def _dispatch_view(view: ui.View, item: ui.Item, interaction):
+        # discord.py 2.0 renamed refresh_state and gave it the component data
+        if hasattr(item, "_refresh_state"):
+            item._refresh_state(interaction, interaction.data)
+        else:
+            item.refresh_state(interaction)
+        view._dispatch_item(item, interaction)
+
+    async def _acquire_limits(self, command: SlashCommand, interaction):
+        # runs before the context is bound, so rejected interactions resolve nothing
+        if command.cooldown is not None:
+            command.cooldown.check(interaction)
+        if command.max_concurrency is not None:
+            try:
+                return await command.max_concurrency.acquire(interaction)
+            except BaseException:
+                # a rejected invocation does not use up the rate limit
+                if command.cooldown is not None:
+                    command.cooldown.refund(interaction)
+                raise
+        return discord.utils.MISSING
+
+    def _release(self, command: SlashCommand, watchdog: Optional[asyncio.TimerHandle] = None,
+                 slot = discord.utils.MISSING):
+        if watchdog is not None:
+            watchdog.cancel()
+        if slot is not discord.utils.MISSING:
+            command.max_concurrency.release(slot)
+
+    async def _invoke(self, context: InteractionContext, interaction,
+                      watchdog: Optional[asyncio.TimerHandle] = None, slot = discord.utils.MISSING):
+        try:
+            try:
+                bound = await context._bind()
+            except BadChoice as error:
+                if context.command.cooldown is not None:
+                    context.command.cooldown.refund(interaction)
+                await self._command_error(context, error)
+                return
+            if not bound:
+                if context.command.cooldown is not None:
+                    context.command.cooldown.refund(interaction)
+                self.log(f"Interaction for '{' '.join((context.command.name, *context.data.path))}', "
+                         f"which has no callback, dropped")
+                return
+            await (context.subcommand or context.command).callback(**context.kwargs)
+        finally:
+            self._release(context.command, watchdog, slot)
+
+    async def _command_error(self, context: InteractionContext, error: Error):
+        if self.bot.extra_events.get("on_slash_command_error") or hasattr(self.bot, "on_slash_command_error"):
+            self.bot.dispatch("slash_command_error", context, error)
+        else:
+            self.log(f"Slash command '{context.command.name}' rejected: {error}")
+            await context.reply(str(error), ephemeral=True)
+
+    async def _job_error(self, interaction, error: Exception):
+        # what discord.py does with an error of the listener when it runs inline
+        await self.bot.on_error("on_interaction", interaction)
+
+    async def _reject_busy(self, context: InteractionContext):
+        self.log(f"Slash command '{context.command.name}' rejected, the dispatcher is full")
+        await context.reply(self.dispatcher.busy_message, ephemeral=True)
+
+    def _deadline_missed(self, command: SlashCommand, context: InteractionContext):
+        if context.responded:
+            return
+        self.deadline_misses[command.name] += 1
+        self.log(f"Slash command '{command.name}' did not respond in time, deferring")
+        task = self.bot.loop.create_task(self._deadline_defer(context))
+        self._deferring.add(task)
+        task.add_done_callback(self._deferring.discard)
+
+    async def _deadline_defer(self, context: InteractionContext):
+        try:
+            await context._auto_defer()
+        except Exception:
+            # reported here, the error of a task is only logged once it is collected
+            await self.bot.on_error("on_interaction", context)
+
+    async def _fetch_payloads(self, guild_id: Optional[int] = None) -> List[dict]:
+        while not self.bot.is_ready():
+            await self.bot.wait_until_ready()
+        add = ""
+        if guild_id:
+            add = f"/guilds/{guild_id}"
 
-            item.refresh_state(interactctx)
-            view._dispatch_item(item, interactctx)
+        return await self.bot.http.request(route=http.Route(
+            "GET", f"/applications/{self.bot.user.id}{add}/commands"))
 
     async def fetch_commands(self, guild_id: Optional[int] = None) -> List[SlashCommand]:
         """fetch a list of slash command currently the bot have
@@ -261,14 +741,7 @@ class SlashClient:
         guild_id: Optional[:class:`~int`]
             Should be given to fetch guild commands, (optional)
         """
-        while not self.bot.is_ready():
-            await self.bot.wait_until_ready()
-        add = ""
-        if guild_id:
-            add = f"/guilds/{guild_id}"
-
-        data = await self.bot.http.request(route=http.Route(
-            "GET", f"/applications/{self.bot.user.id}{add}/commands"))
+        data = await self._fetch_payloads(guild_id)
         ret = []
         for i in data:
             if i["type"] == 1:
@@ -276,28 +749,44 @@ class SlashClient:
 
         return ret
 
-    def get_commands(self) -> Dict[str, SlashCommand]:
-        """Gets every command registered in the current running instance"""
-        ret = {}
+    def get_commands(self, guild: Optional[int] = discord.utils.MISSING) -> Mapping[str, SlashCommand]:
+        """Gets every command registered in the current running instance
+
+        Parameters
+        -----------
+        guild: Optional[:class:`~int`]
+            Gives only the commands of this scope, None for global commands,
+            every command if not given, global ones take precedence on name clashes"""
+        if guild is not discord.utils.MISSING:
+            return self.registry.scope(guild)
 
-        for i in self.__commands:
-            ret[self.__commands[i]['command'].name] = self.__commands[i]['command']
+        ret = {}
+        for scope in sorted(self.registry.scopes(), key=lambda g: g is None):
+            ret.update(self.registry.scope(scope))
 
         return ret
 
-    def get_command(self, name: str) -> SlashCommand:
+    def get_command(self, name: str, guild: Optional[int] = None) -> SlashCommand:
         """Gives a command registered in this module
         
         Parameters
         -----------
         name: :class:`~str`
-            the name from which command is to be found"""
+            the name from which command is to be found
+        guild: Optional[:class:`~int`]
+            the guild to look in first, the global commands are looked in after it"""
+        command = None
+        if guild is not None:
+            command = self.registry.get(name, guild)
 
-        return (self.get_commands()).get(name)
+        return command or self.registry.get(name)
 
-    async def add_command(self, command: SlashCommand):
+    async def add_command(self, command: SlashCommand) -> SyncReport:
         """Adds a slash command to bot
 
+        The command is registered locally and synced with every other
+        command added in the same tick, see :meth:`sync_commands`.
+
         Parameters
         -----------
         command: :class:`~slash.models.SlashCommand`
@@ -306,39 +795,134 @@ class SlashClient:
         Raises
         -------
         .CommandExists
-            That slash cmd is already registered in bot with this module"""
-        slashcmds = await self.fetch_commands(None)
+            That slash cmd is already registered in bot with this module
 
-        if command.guild:
-            slashcmds = await self.fetch_commands(command.guild)
+        Returns
+        --------
+        :class:`~slash.sync.SyncReport`
+            The report of the sync which registered the command"""
+        self.registry.add(command)
+        self._dirty_scopes.add(command.guild)
+        return await self._schedule_sync()
+
+    def _schedule_sync(self) -> asyncio.Task:
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = self.bot.loop.create_task(self._sync_dirty())
+        return self._sync_task
+
+    async def _sync_dirty(self) -> SyncReport:
+        while not self.bot.is_ready():
+            await self.bot.wait_until_ready()
 
-        if command.name in self.get_commands():
-            raise CommandExists(
-                f"Command '{command.name}' has already been registered!")
-        else:
-            if command in slashcmds:
-                await self.remove_command(command.name)
+        report = SyncReport()
+        while self._dirty_scopes:
+            scopes, self._dirty_scopes = self._dirty_scopes, set()
+            for guild in scopes:
+                report.merge(await self.sync_commands(guild))
+        return report
 
-            add = ""
-            l_add = ""
-            if command.guild:
-                add = f"/guilds/{command.guild}"
-                l_add = f"Guild command for '{command.guild}'"
+    async def sync_commands(self,
+                            guild: Optional[int] = discord.utils.MISSING,
+                            *,
+                            bulk: bool = True,
+                            force: bool = False) -> SyncReport:
+        """Syncs the locally added commands with discord
 
-            resp = await self.bot.http.request(route=http.Route(
-                "POST", f"/applications/{self.bot.user.id}{add}/commands"),
-                                        json=command.ret_dict())
+        Every scope is fetched once and compared with the local payloads,
+        nothing is written when they already match. Scopes matching the
+        manifest are not fetched at all.
 
-            self.log(f"Slash command '{command.name}' (ID: {resp['id']}) registered! {l_add}")
+        Parameters
+        -----------
+        guild: Optional[:class:`~int`]
+            The scope to sync, None for global commands, every scope if not given
+        bulk: :class:`~bool`
+            Whether to overwrite a changed scope with one bulk PUT, otherwise
+            only the needed creates, patches and deletes are sent, defaults to True
+        force: :class:`~bool`
+            Whether to ignore the manifest, defaults to False
 
-            self.__commands[int(resp['id'])] = {
-                "guild": None if 'guild_id' not in resp else int(resp['guild_id']),
-                "command": command
-            }
+        Returns
+        --------
+        :class:`~slash.sync.SyncReport`
+            What was changed in every scope"""
+        if guild is discord.utils.MISSING:
+            scopes = {None, *self.registry.scopes()}
+        else:
+            scopes = {guild}
+
+        report = SyncReport()
+        for scope in scopes:
+            report.add(await self._sync_scope(scope, bulk, force))
+
+        if self.manifest and any(not diff.cached for diff in report.scopes.values()):
+            self.manifest.save()
+        return report
+
+    async def _sync_scope(self, guild: Optional[int], bulk: bool, force: bool) -> ScopeDiff:
+        local = self.registry.scope(guild)
+        payloads = {name: cmd.ret_dict() for name, cmd in local.items()}
+        digest = scope_hash(payloads)
+
+        if self.manifest and not force:
+            ids = self.manifest.lookup(self.bot.user.id, guild, digest)
+            if ids is not None and ids.keys() == local.keys():
+                diff = ScopeDiff(guild)
+                diff.cached = True
+                diff.unchanged.extend(local)
+                diff.ids = ids
+                self._bind_scope(guild, diff)
+                self.log(f"Slash commands of scope '{guild or 'global'}' are unchanged, sync skipped")
+                return diff
+
+        remote = await self._fetch_payloads(guild)
+        diff = ScopeDiff.compute(guild, payloads, remote)
+        diff.requests += 1
+
+        add = f"/guilds/{guild}" if guild else ""
+        base = f"/applications/{self.bot.user.id}{add}/commands"
+        ids = diff.ids
+
+        if diff.changed and bulk:
+            resp = await self.bot.http.request(route=http.Route("PUT", base),
+                                               json=list(payloads.values()))
+            diff.requests += 1
+            ids = diff.ids = {i["name"]: int(i["id"]) for i in resp}
+        elif diff.changed:
+            for name in diff.created:
+                resp = await self.bot.http.request(route=http.Route("POST", base),
+                                                   json=payloads[name])
+                diff.requests += 1
+                ids[name] = int(resp["id"])
+            for name in diff.updated:
+                await self.bot.http.request(route=http.Route(
+                    "PATCH", f"{base}/{ids[name]}"), json=payloads[name])
+                diff.requests += 1
+            for name in diff.deleted:
+                await self.bot.http.request(route=http.Route(
+                    "DELETE", f"{base}/{ids.pop(name)}"))
+                diff.requests += 1
+
+        self._bind_scope(guild, diff)
+        if self.manifest:
+            self.manifest.update(self.bot.user.id, guild, digest, ids)
+        return diff
+
+    def _bind_scope(self, guild: Optional[int], diff: ScopeDiff):
+        self.registry.bind(guild, diff.ids)
+        for _id in [i for i, r in self._warm_ids.items() if r[0] == guild]:
+            self._warm_ids.pop(_id)
+
+        l_add = f"Guild command for '{guild}'" if guild else ""
+        for name in self.registry.scope(guild):
+            if name in diff.created or name in diff.updated:
+                self.log(f"Slash command '{name}' (ID: {diff.ids[name]}) registered! {l_add}")
 
     def reload_command(self, command: SlashCommand):
         """Reloads a slash command
 
+        The command is synced again in the background if its payload changed.
+
         Parameters
         -----------
         command: :class:`~slash.models.SlashCommand`
@@ -348,39 +932,42 @@ class SlashClient:
         --------
         .CommandNotRegistered
             That command is not registered"""
-        a = self.__commands
-        listenerlist = {self.__commands[i]['command'].name: i for i in self.__commands}
-        _id = listenerlist.get(command.name)
+        old = self.registry.replace(command)
 
-        if not _id:
-            raise CommandNotRegistered(
-                f"Command '{command.name}' has not been registered.")
-        else:
-            self.__commands.pop(_id)
-            self.__commands[_id] = {
-                "guild": command.guild,
-                "command": command
-            }
+        if old.ret_dict() != command.ret_dict():
+            self._dirty_scopes.add(command.guild)
+            self._schedule_sync()
 
-            self.log(f"Slash command '{command.name}' reloaded!")
+        self.log(f"Slash command '{command.name}' reloaded!")
 
-    async def remove_command(self, name: str):
+    async def remove_command(self, name: str, guild: Optional[int] = None):
         """Removes command from the name given
 
         Parameters
         ------------
         name: :class:`~str`
-            Name of the command"""
-        listenerlist = {self.__commands[i]['command'].name: i for i in self.__commands}
-        _id = listenerlist.get(name)
-
-        if not _id:
-            raise CommandDoesNotExists(f"Command '{name}' does not exist!")
-        else:
-            await self.bot.http.request(route=http.Route(
-                "DELETE", f"/applications/{self.bot.user.id}/commands/{_id}"))
+            Name of the command
+        guild: Optional[:class:`~int`]
+            The guild of the command, None if it is global
 
-            self.__commands.pop(_id)
+        Raises
+        -------
+        .CommandDoesNotExists
+            That command is not registered"""
+        command, _id = self.registry.remove(name, guild)
+        if _id is None:
+            # not synced yet, or its sync is in flight and would register it again
+            self._dirty_scopes.add(command.guild)
+            self._schedule_sync()
+            return
+
+        add = f"/guilds/{guild}" if guild else ""
+        await self.bot.http.request(route=http.Route(
+            "DELETE", f"/applications/{self.bot.user.id}{add}/commands/{_id}"))
+
+        if self.manifest:
+            self.manifest.discard(guild)
+            self.manifest.save()
 
     def load_extension(self, name: str):
         """Load a command from an external file.
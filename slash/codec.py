@@ -0,0 +1,79 @@
+import json
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+__all__ = (
+    "JSONCodec",
+    "OrjsonCodec",
+    "StdlibCodec",
+    "default_codec"
+)
+
+
+class JSONCodec:
+    """Base class of the json codecs a :class:`~slash.client.SlashClient`
+    encodes request bodies and decodes responses with
+
+    Subclass it to plug in another json library.
+    """
+    #: The name shown in stats and logs
+    name: str = "json"
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name='{self.name}'>"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes an object to utf-8 json"""
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodes json"""
+        raise NotImplementedError
+
+
+class StdlibCodec(JSONCodec):
+    """The codec of the :mod:`json` module of the standard library"""
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        # compact like discord.py, the default separators waste a byte per key
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """The codec of `orjson <https://github.com/ijl/orjson>`_, several times
+    faster than the standard library
+
+    Raises
+    -------
+    RuntimeError
+        orjson is not installed
+    """
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed, install it with 'pip install orjson'")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> JSONCodec:
+    """Gives the fastest installed codec, orjson if it is installed and the
+    standard library otherwise"""
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibCodec()
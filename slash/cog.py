@@ -37,6 +37,10 @@ def command(*args, cls=MISSING, **kwargs):
         Options for the command, detects automatically if None given, (optional)
     cls: :class:`~slash.models.SlashCommand`
         The custom command class, must be a subclass of :class:`~slash.models.SlashCommand`, (optional)
+    cooldown: Optional[:class:`~slash.cooldowns.Cooldown`]
+        Rate limit of the command, (optional)
+    max_concurrency: Optional[:class:`~slash.cooldowns.MaxConcurrency`]
+        How many times the command can run at once, (optional)
 
     Example
     ----------
@@ -109,11 +113,10 @@ class SlashCog(Cog):
 
     def _inject(self, bot):
         new_list = []
-        for i, cmd in enumerate(self.__slash_commands__):
-            cmd, cog = data
+        for cmd, _ in self.__slash_commands__:
             wrapped = _cmd(bot.slashclient, *cmd.args, cls=cmd._cls, **cmd.kwargs)
             cmd = wrapped(cmd.callback)
-            cmd.cog = cog
+            cmd.cog = self
             new_list.append(cmd)
             setattr(self, cmd.name, cmd.callback)
 
@@ -123,6 +126,6 @@ class SlashCog(Cog):
     def _eject(self, bot):
         slash, loop = bot.slashclient, bot.loop
         for cmd in self.__slash_commands__:
-            loop.create_task(slash.remove_command(cmd.name))
+            loop.create_task(slash.remove_command(cmd.name, cmd.guild))
             
         super()._eject(bot)
@@ -0,0 +1,207 @@
+import re
+import asyncio
+
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+
+__all__ = (
+    "ComponentHandler",
+    "ComponentRouter"
+)
+
+_FIELD = re.compile(r"{(\w+)(?::(\w+))?}")
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float
+}
+
+
+class ComponentHandler:
+    """A persistent handler of every component whose custom id matches a template
+
+    Parameters
+    ------------
+    template: :class:`~str`
+        The custom id template, fields are written as ``{name}`` or
+        ``{name:int}`` (``str``, ``int`` and ``float`` are supported)
+    callback: Coroutine
+        Called with the :class:`~discord.Interaction` and the fields as keyword arguments
+    prefix: :class:`~bool`
+        Whether custom ids may continue after the template, defaults to False
+
+    Raises
+    -------
+    ValueError
+        Two fields follow each other without text between them or a
+        converter is unknown
+    """
+    def __init__(self, template: str, callback: Callable[..., Coroutine], prefix: bool = False) -> None:
+        if not asyncio.iscoroutinefunction(callback):
+            raise TypeError('Callback must be a coroutine.')
+        self.template = template
+        self.callback = callback
+        self.prefix = prefix
+        # alternating literal and (name, converter) parts, starting with a literal
+        self._parts: List[Any] = []
+
+        end = 0
+        for match in _FIELD.finditer(template):
+            literal = template[end:match.start()]
+            if self._parts and not literal:
+                raise ValueError(f"Fields of '{template}' must be separated by text")
+            converter = match.group(2) or "str"
+            if converter not in _CONVERTERS:
+                raise ValueError(f"Unknown converter '{converter}' in '{template}'")
+            self._parts.append(literal)
+            self._parts.append((match.group(1), _CONVERTERS[converter]))
+            end = match.end()
+        self._parts.append(template[end:])
+
+    def __repr__(self):
+        return f"<ComponentHandler template='{self.template}' prefix={self.prefix}>"
+
+    @property
+    def literal(self) -> str:
+        """The text of the template before its first field"""
+        return self._parts[0]
+
+    def match(self, custom_id: str) -> Optional[Dict[str, Any]]:
+        """Extracts the fields of a custom id, None if it does not match
+
+        A field ends at the first occurrence of the text which follows it,
+        the last one spans the rest of the custom id unless the template
+        ends with text."""
+        parts = self._parts
+        if not custom_id.startswith(parts[0]):
+            return None
+
+        fields, pos = {}, len(parts[0])
+        for i in range(1, len(parts), 2):
+            name, converter = parts[i]
+            literal = parts[i + 1]
+            if literal:
+                # a field has at least one character
+                end = custom_id.find(literal, pos + 1)
+                if end == -1:
+                    return None
+            else:
+                # only the last field is not followed by text
+                end = len(custom_id)
+                if end <= pos:
+                    return None
+            try:
+                fields[name] = converter(custom_id[pos:end])
+            except ValueError:
+                return None
+            pos = end + len(literal)
+
+        if pos != len(custom_id) and not self.prefix:
+            return None
+        return fields
+
+
+class _Node:
+    __slots__ = ("children", "handlers")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_Node'] = {}
+        self.handlers: List[ComponentHandler] = []
+
+
+class ComponentRouter:
+    """Routes component interactions to persistent handlers by their custom id
+
+    Handlers are stored in a prefix trie keyed by the text of their template
+    before the first field, so a custom id is matched in one walk over its
+    characters and only the handlers along that walk are tried, the most
+    specific one first. Nothing is stored per message, so one handler serves
+    any number of buttons and keeps working after a restart.
+
+    **Attributes**
+
+    Attributes
+    ------------
+    hits: :class:`~int`
+        Number of custom ids which matched a handler
+    misses: :class:`~int`
+        Number of custom ids which matched nothing
+    """
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._handlers: Dict[str, ComponentHandler] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self):
+        return f"<ComponentRouter handlers={len(self._handlers)}>"
+
+    def __len__(self):
+        return len(self._handlers)
+
+    def add(self, handler: ComponentHandler):
+        """Adds a handler
+
+        Raises
+        -------
+        ValueError
+            A handler with the same template has already been added"""
+        if handler.template in self._handlers:
+            raise ValueError(f"A handler for '{handler.template}' has already been added")
+
+        node = self._root
+        for char in handler.literal:
+            node = node.children.setdefault(char, _Node())
+        node.handlers.append(handler)
+        self._handlers[handler.template] = handler
+
+    def remove(self, template: str) -> Optional[ComponentHandler]:
+        """Removes the handler of a template and gives it, None if there is none"""
+        handler = self._handlers.pop(template, None)
+        if handler is None:
+            return None
+
+        path = [self._root]
+        for char in handler.literal:
+            path.append(path[-1].children[char])
+        path[-1].handlers.remove(handler)
+
+        # prune the branches which lead to no handler anymore
+        for depth in range(len(handler.literal), 0, -1):
+            node = path[depth]
+            if node.children or node.handlers:
+                break
+            del path[depth - 1].children[handler.literal[depth - 1]]
+        return handler
+
+    def match(self, custom_id: str) -> Optional[Tuple[ComponentHandler, Dict[str, Any]]]:
+        """Gives the most specific handler of a custom id and its fields
+
+        Returns
+        --------
+        Optional[Tuple[:class:`ComponentHandler`, Dict[:class:`~str`, Any]]]
+            The handler and the extracted fields, None if nothing matched"""
+        node, candidates = self._root, [self._root.handlers]
+        for char in custom_id:
+            node = node.children.get(char)
+            if node is None:
+                break
+            candidates.append(node.handlers)
+
+        for handlers in reversed(candidates):
+            for handler in handlers:
+                fields = handler.match(custom_id)
+                if fields is not None:
+                    self.hits += 1
+                    return handler, fields
+
+        self.misses += 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Gives the number of handlers and the hit/miss counters"""
+        return {
+            "handlers": len(self._handlers),
+            "hits": self.hits,
+            "misses": self.misses
+        }
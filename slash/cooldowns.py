@@ -0,0 +1,187 @@
+import time
+import asyncio
+
+from .enums import BucketType
+from .exceptions import CommandOnCooldown, MaxConcurrencyReached
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+__all__ = (
+    "Cooldown",
+    "MaxConcurrency"
+)
+
+
+class Cooldown:
+    """A token bucket rate limit for a command
+
+    Every bucket holds up to ``rate`` tokens and refills at ``rate`` tokens
+    per ``per`` seconds, a use takes one token.
+
+    Parameters
+    ------------
+    rate: :class:`~int`
+        Number of uses allowed in a burst
+    per: :class:`~float`
+        Seconds in which the bucket refills completely
+    type: :class:`~slash.enums.BucketType`
+        What the buckets are kept per, defaults to ``user``
+    max_buckets: :class:`~int`
+        Maximum number of buckets kept, the least recently used are dropped, defaults to 10000
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        from slash import BucketType, Cooldown
+
+        @slash.command(name="render", cooldown=Cooldown(2, 30, BucketType.user))
+        async def render(ctx):
+            ...
+    """
+    def __init__(self, rate: int, per: float, type: BucketType = BucketType.user, max_buckets: int = 10000) -> None:
+        if rate < 1 or per <= 0:
+            raise ValueError("rate must be at least 1 and per must be positive")
+        self.rate = int(rate)
+        self.per = float(per)
+        self.type = type
+        self.max_buckets = max_buckets
+        self._buckets: 'OrderedDict[Hashable, Tuple[float, float]]' = OrderedDict()
+
+    def __repr__(self):
+        return f"<Cooldown rate={self.rate} per={self.per} type={self.type.name} buckets={len(self._buckets)}>"
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _sweep(self, now: float):
+        # buckets are ordered by last use, an idle one is full again and can go
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < self.per and len(self._buckets) <= self.max_buckets:
+                break
+            del self._buckets[key]
+
+    def update(self, key: Hashable, now: Optional[float] = None) -> Optional[float]:
+        """Takes a token from a bucket
+
+        Parameters
+        ------------
+        key: Hashable
+            The bucket key
+        now: Optional[:class:`~float`]
+            The :func:`time.monotonic` time, (optional)
+
+        Returns
+        --------
+        Optional[:class:`~float`]
+            Seconds until a token is available, None if one was taken"""
+        now = time.monotonic() if now is None else now
+        tokens, last = self._buckets.pop(key, (float(self.rate), now))
+        tokens = min(float(self.rate), tokens + (now - last) * self.rate / self.per)
+
+        retry_after = None
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) * self.per / self.rate
+
+        self._buckets[key] = (tokens, now)
+        self._sweep(now)
+        return retry_after
+
+    def check(self, interaction):
+        """Takes a token for an interaction
+
+        Raises
+        -------
+        .CommandOnCooldown
+            The bucket of the interaction is empty"""
+        retry_after = self.update(self.type.get_key(interaction))
+        if retry_after is not None:
+            raise CommandOnCooldown(self, retry_after)
+
+    def refund(self, interaction):
+        """Gives back the token taken by :meth:`check` for an interaction
+        which was rejected afterwards"""
+        key = self.type.get_key(interaction)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            tokens, last = bucket
+            self._buckets[key] = (min(float(self.rate), tokens + 1), last)
+
+    def reset(self, key: Optional[Hashable] = None):
+        """Refills one bucket, or every bucket if no key is given"""
+        if key is None:
+            self._buckets.clear()
+        else:
+            self._buckets.pop(key, None)
+
+
+class MaxConcurrency:
+    """Limits how many times a command runs at once
+
+    Parameters
+    ------------
+    number: :class:`~int`
+        Number of callbacks which can run at once per bucket
+    per: :class:`~slash.enums.BucketType`
+        What the limit is counted per, defaults to ``default`` (globally)
+    wait: :class:`~bool`
+        Whether to wait for a slot instead of rejecting the interaction, defaults to False
+    """
+    def __init__(self, number: int, per: BucketType = BucketType.default, *, wait: bool = False) -> None:
+        if number < 1:
+            raise ValueError("number must be at least 1")
+        self.number = number
+        self.per = per
+        self.wait = wait
+        self._running: Dict[Hashable, int] = {}
+        self._semaphores: Dict[Hashable, asyncio.Semaphore] = {}
+
+    def __repr__(self):
+        return f"<MaxConcurrency number={self.number} per={self.per.name} wait={self.wait} buckets={len(self._running)}>"
+
+    async def acquire(self, interaction) -> Hashable:
+        """Takes a slot for an interaction
+
+        Raises
+        -------
+        .MaxConcurrencyReached
+            Every slot is taken and ``wait`` is False
+
+        Returns
+        --------
+        Hashable
+            The bucket key to give to :meth:`release`"""
+        key = self.per.get_key(interaction)
+        sem = self._semaphores.get(key)
+        if sem is None:
+            sem = self._semaphores[key] = asyncio.Semaphore(self.number)
+        elif sem.locked() and not self.wait:
+            raise MaxConcurrencyReached(self.number, self.per)
+
+        self._running[key] = self._running.get(key, 0) + 1
+        try:
+            await sem.acquire()
+        except BaseException:
+            self._forget(key)
+            raise
+        return key
+
+    def release(self, key: Hashable):
+        """Gives back a slot taken with :meth:`acquire`"""
+        sem = self._semaphores.get(key)
+        if sem is not None:
+            sem.release()
+            self._forget(key)
+
+    def _forget(self, key: Hashable):
+        # the semaphore is only kept while someone holds or waits for it
+        self._running[key] -= 1
+        if not self._running[key]:
+            del self._running[key]
+            del self._semaphores[key]
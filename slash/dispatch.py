@@ -0,0 +1,372 @@
+import time
+import asyncio
+import traceback
+
+from .enums import OverflowPolicy
+
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple, Union
+
+
+__all__ = (
+    "Dispatcher",
+    "FairDispatcher"
+)
+
+Job = Callable[[], Awaitable[None]]
+ErrorHandler = Callable[[Exception], Awaitable[None]]
+Item = Tuple[float, Job, Optional[ErrorHandler]]
+
+_NOTHING = object()
+
+
+class Dispatcher:
+    """Runs command callbacks on a fixed number of worker tasks fed by a
+    bounded queue, instead of inline in the interaction listener
+
+    Parameters
+    ------------
+    workers: :class:`~int`
+        Number of callbacks which run at once, defaults to 16
+    max_queue: :class:`~int`
+        Number of interactions which can wait for a worker, defaults to 1000
+    policy: Union[:class:`~slash.enums.OverflowPolicy`, :class:`~str`]
+        What to do when the queue is full, defaults to ``reject``
+    busy_message: :class:`~str`
+        The ephemeral reply sent with the ``reject`` policy
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        from slash import Dispatcher, SlashClient
+
+        slash = SlashClient(bot, dispatcher=Dispatcher(workers=8, max_queue=500, policy="drop"))
+    """
+    def __init__(self,
+                 workers: int = 16,
+                 max_queue: int = 1000,
+                 policy: Union[OverflowPolicy, str] = OverflowPolicy.reject,
+                 busy_message: str = "The bot is busy right now, please try again in a moment.") -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.policy = OverflowPolicy(policy)
+        self.busy_message = busy_message
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._active: int = 0
+        self._submitted: int = 0
+        self._processed: int = 0
+        self._rejected: int = 0
+        self._dropped: int = 0
+        self._failed: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+        self._max_depth: int = 0
+
+    def __repr__(self):
+        return f"<Dispatcher workers={self.workers} depth={self.depth} policy={self.policy.value}>"
+
+    @property
+    def depth(self) -> int:
+        """Number of interactions waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def full(self) -> bool:
+        """Whether the queue is full"""
+        return self.depth >= self.max_queue
+
+    def _start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(self.max_queue)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def _enqueue(self, key: Hashable, item: Item, block: bool) -> bool:
+        if block:
+            await self._queue.put(item)
+            return True
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _dequeue(self) -> Tuple[Hashable, Item]:
+        return None, await self._queue.get()
+
+    async def _finish(self, key: Hashable):
+        self._queue.task_done()
+
+    async def _worker(self):
+        while True:
+            key, (enqueued, job, on_error) = await self._dequeue()
+            wait = time.monotonic() - enqueued
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._active += 1
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self._failed += 1
+                await self._report(error, on_error)
+            finally:
+                self._active -= 1
+                self._processed += 1
+                await self._finish(key)
+
+    @staticmethod
+    async def _report(error: Exception, on_error: Optional[ErrorHandler]):
+        # awaited while the error is handled, so the handler can use sys.exc_info
+        if on_error is None:
+            traceback.print_exc()
+            return
+        try:
+            await on_error(error)
+        except Exception:
+            traceback.print_exc()
+
+    async def submit(self, job: Job, on_reject: Optional[Job] = None, key: Hashable = None,
+                     on_error: Optional[ErrorHandler] = None) -> bool:
+        """Queues a job for the workers
+
+        Parameters
+        ------------
+        job: Callable[[], Awaitable]
+            The job, it is awaited by a worker
+        on_reject: Optional[Callable[[], Awaitable]]
+            Awaited instead when the job is rejected
+        key: Hashable
+            The queue of the job for dispatchers which have more than one,
+            the guild id of the interaction
+        on_error: Optional[Callable[[Exception], Awaitable]]
+            Awaited with the error when the job raises, the traceback is
+            printed if not given
+
+        Returns
+        --------
+        :class:`~bool`
+            Whether the job was queued"""
+        self._start()
+        item = (time.monotonic(), job, on_error)
+
+        if not await self._enqueue(key, item, self.policy is OverflowPolicy.block):
+            if self.policy is OverflowPolicy.drop:
+                self._dropped += 1
+                return False
+            self._rejected += 1
+            if on_reject is not None:
+                await on_reject()
+            return False
+
+        self._submitted += 1
+        self._max_depth = max(self._max_depth, self.depth)
+        return True
+
+    async def join(self):
+        """Waits until every queued job is done"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Stops the workers, queued jobs are discarded"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Gives the queue depth and wait time metrics
+
+        Returns
+        --------
+        Dict[:class:`~str`, Union[:class:`~int`, :class:`~float`]]
+            ``depth``, ``max_depth``, ``active``, ``submitted``, ``processed``,
+            ``failed``, ``rejected``, ``dropped`` and the ``wait_avg`` and
+            ``wait_max`` seconds a job waited for a worker"""
+        started = self._processed + self._active
+        return {
+            "depth": self.depth,
+            "max_depth": self._max_depth,
+            "active": self._active,
+            "submitted": self._submitted,
+            "processed": self._processed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "dropped": self._dropped,
+            "wait_avg": self._wait_total / started if started else 0.0,
+            "wait_max": self._wait_max
+        }
+
+
+class FairDispatcher(Dispatcher):
+    """A :class:`Dispatcher` which keeps one queue per guild and serves them
+    in turn, so one busy guild can't starve the others
+
+    Parameters
+    ------------
+    workers: :class:`~int`
+        Number of callbacks which run at once, defaults to 16
+    max_queue: :class:`~int`
+        Number of interactions of every guild which can wait, defaults to 1000
+    policy: Union[:class:`~slash.enums.OverflowPolicy`, :class:`~str`]
+        What to do when a queue is full, defaults to ``reject``
+    busy_message: :class:`~str`
+        The ephemeral reply sent with the ``reject`` policy
+    mode: :class:`~str`
+        ``"round_robin"`` serves one interaction of every guild in turn,
+        ``"deficit"`` serves as many as the weight of the guild in each turn,
+        defaults to ``"round_robin"``
+    weights: Optional[Dict[:class:`~int`, :class:`~float`]]
+        Positive weights of guilds for the ``deficit`` mode, others weigh 1
+    max_per_guild: Optional[:class:`~int`]
+        Number of callbacks of one guild which run at once, (optional)
+    max_queue_per_guild: Optional[:class:`~int`]
+        Number of interactions of one guild which can wait, (optional)
+    """
+    MODES = ("round_robin", "deficit")
+
+    def __init__(self,
+                 workers: int = 16,
+                 max_queue: int = 1000,
+                 policy: Union[OverflowPolicy, str] = OverflowPolicy.reject,
+                 busy_message: str = "The bot is busy right now, please try again in a moment.",
+                 *,
+                 mode: str = "round_robin",
+                 weights: Optional[Dict[int, float]] = None,
+                 max_per_guild: Optional[int] = None,
+                 max_queue_per_guild: Optional[int] = None) -> None:
+        super().__init__(workers, max_queue, policy, busy_message)
+        if mode not in self.MODES:
+            raise ValueError(f"mode should be one of {self.MODES} not {mode!r}")
+        if weights and any(w <= 0 for w in weights.values()):
+            raise ValueError("weights must be positive")
+        self.mode = mode
+        self.weights: Dict[int, float] = dict(weights or {})
+        self.max_per_guild = max_per_guild
+        self.max_queue_per_guild = max_queue_per_guild
+        self._queues: Dict[Hashable, Deque[Item]] = {}
+        self._ring: Deque[Hashable] = deque()
+        self._deficit: Dict[Hashable, float] = {}
+        self._running: Counter = Counter()
+        self._size: int = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    def __repr__(self):
+        return f"<FairDispatcher workers={self.workers} depth={self.depth} guilds={len(self._queues)} mode={self.mode}>"
+
+    @property
+    def depth(self) -> int:
+        return self._size
+
+    def guild_depth(self, guild_id: Optional[int]) -> int:
+        """Number of interactions of a guild waiting for a worker"""
+        queue = self._queues.get(guild_id)
+        return len(queue) if queue is not None else 0
+
+    def _start(self):
+        if self._tasks:
+            return
+        self._cond = asyncio.Condition()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    def _has_room(self, key: Hashable) -> bool:
+        if self._size >= self.max_queue:
+            return False
+        return self.max_queue_per_guild is None or self.guild_depth(key) < self.max_queue_per_guild
+
+    def _capped(self, key: Hashable) -> bool:
+        return self.max_per_guild is not None and self._running[key] >= self.max_per_guild
+
+    async def _enqueue(self, key: Hashable, item: Item, block: bool) -> bool:
+        async with self._cond:
+            if block:
+                await self._cond.wait_for(lambda: self._has_room(key))
+            elif not self._has_room(key):
+                return False
+
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+                self._deficit[key] = 0.0
+                self._ring.append(key)
+            queue.append(item)
+            self._size += 1
+            self._cond.notify_all()
+        return True
+
+    def _pick(self) -> Any:
+        ring = self._ring
+        if all(self._capped(key) for key in ring):
+            return _NOTHING
+
+        if self.mode == "round_robin":
+            while True:
+                key = ring[0]
+                ring.rotate(-1)
+                if not self._capped(key):
+                    return key
+
+        while True:
+            key = ring[0]
+            if not self._capped(key):
+                if self._deficit[key] >= 1:
+                    self._deficit[key] -= 1
+                    return key
+                self._deficit[key] += self.weights.get(key, 1)
+            ring.rotate(-1)
+
+    async def _dequeue(self) -> Tuple[Hashable, Item]:
+        async with self._cond:
+            while True:
+                key = self._pick()
+                if key is not _NOTHING:
+                    break
+                await self._cond.wait()
+            queue = self._queues[key]
+            item = queue.popleft()
+            if not queue:
+                del self._queues[key]
+                del self._deficit[key]
+                self._ring.remove(key)
+            self._size -= 1
+            self._running[key] += 1
+            self._cond.notify_all()
+        return key, item
+
+    async def _finish(self, key: Hashable):
+        async with self._cond:
+            self._running[key] -= 1
+            if not self._running[key]:
+                del self._running[key]
+            self._cond.notify_all()
+
+    async def join(self):
+        if self._cond is not None:
+            async with self._cond:
+                await self._cond.wait_for(lambda: not self._size and not self._running)
+
+    async def close(self):
+        await super().close()
+        self._queues.clear()
+        self._ring.clear()
+        self._deficit.clear()
+        self._running.clear()
+        self._size = 0
+        self._cond = None
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Same as :meth:`Dispatcher.stats` with ``guilds``, the number of
+        guilds which have interactions waiting"""
+        ret = super().stats()
+        ret["guilds"] = len(self._queues)
+        return ret
@@ -0,0 +1,152 @@
+import asyncio
+import discord
+
+from typing import Any, Dict, Optional
+
+
+__all__ = ("CoalescingEditor",)
+
+
+class CoalescingEditor:
+    """Edits the response of an interaction at most once per ``interval``
+    seconds, made with :meth:`~slash.models.InteractionContext.editor`
+
+    :meth:`update` only stores the new state, a background task sends the
+    latest stored state whenever the interval allows it and skips every
+    state which was replaced before it could be sent. One edit is sent at a
+    time, so they arrive in order. :meth:`finish` sends the pending state
+    right away and waits for it, so the final message is always the last
+    state.
+
+    Parameters
+    ------------
+    ctx: :class:`~slash.models.InteractionContext`
+        The context, the first edit is sent as the reply if it was not
+        responded to yet
+    interval: :class:`~float`
+        Minimum seconds between two edits, defaults to 1
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        await ctx.defer()
+        async with ctx.editor(interval=0.5) as editor:
+            for done, total in progress():
+                editor.update(f"{done}/{total}")
+            editor.update("Done!")
+
+    **Attributes**
+
+    Attributes
+    ------------
+    updates: :class:`~int`
+        Number of states given
+    edits: :class:`~int`
+        Number of edits sent
+    result: Optional[:class:`~discord.Message`]
+        The message returned by the last edit
+    """
+    def __init__(self, ctx, interval: float = 1.0) -> None:
+        self.ctx = ctx
+        self.interval = interval
+        self.updates: int = 0
+        self.edits: int = 0
+        self.result: Optional[discord.Message] = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last: float = float("-inf")
+        self._hurry = asyncio.Event()
+        self._finished = False
+        self._error: Optional[BaseException] = None
+
+    def __repr__(self):
+        return f"<CoalescingEditor updates={self.updates} edits={self.edits} interval={self.interval}>"
+
+    async def __aenter__(self) -> 'CoalescingEditor':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.finish()
+
+    @property
+    def pending(self) -> bool:
+        """Whether a state is waiting to be sent"""
+        return self._pending is not None
+
+    def update(self, content: str = None, **kwargs: Any):
+        """Stores the next state of the message, takes the arguments of
+        :meth:`~slash.models.InteractionContext.edit`
+
+        Raises
+        -------
+        RuntimeError
+            The editor is finished
+        :exc:`~discord.HTTPException`
+            An earlier edit failed, the editor stops sending then"""
+        self._raise()
+        if self._finished:
+            raise RuntimeError("The editor is finished")
+
+        self._pending = {"content": content, **kwargs}
+        self.updates += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            self._finished = True
+            raise error
+
+    async def _run(self):
+        try:
+            await self._edit()
+        except Exception as error:
+            # kept for finish() or the next update(), the task never raises
+            self._error = error
+            self._pending = None
+
+    async def _edit(self):
+        loop = asyncio.get_running_loop()
+        while self._pending is not None:
+            wait = self._last + self.interval - loop.time()
+            if wait > 0 and not self._hurry.is_set():
+                try:
+                    await asyncio.wait_for(self._hurry.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            kwargs, self._pending = self._pending, None
+            self._last = loop.time()
+            self.edits += 1
+            self.result = await self.ctx.edit(**kwargs)
+
+    async def finish(self, *args: Any, **kwargs: Any) -> Optional[discord.Message]:
+        """Sends the pending state now and waits until every edit is sent,
+        the arguments are stored as the last state if given
+
+        Raises
+        -------
+        :exc:`~discord.HTTPException`
+            An edit failed, now or earlier
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore
+
+        Returns
+        --------
+        Optional[:class:`~discord.Message`]
+            The message returned by the last edit"""
+        self._raise()
+        if self._finished:
+            return self.result
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+        self._finished = True
+        self._hurry.set()
+        if self._task is not None:
+            await self._task
+        self._raise()
+        return self.result
@@ -1,7 +1,7 @@
 import typing
 import discord
 
-from enum import IntEnum
+from enum import Enum, IntEnum
 
 
 class OptionType(IntEnum):
@@ -64,5 +64,67 @@ class OptionType(IntEnum):
             return cls.FLOAT
 
 
+class OverflowPolicy(Enum):
+    """What a :class:`~slash.dispatch.Dispatcher` does with an interaction
+    when its queue is full"""
+
+    #: Reply with an ephemeral busy message
+    reject = "reject"
+    #: Ignore the interaction
+    drop = "drop"
+    #: Wait until the queue has room
+    block = "block"
+
+
+class BucketType(Enum):
+    """What a :class:`~slash.cooldowns.Cooldown` or
+    :class:`~slash.cooldowns.MaxConcurrency` is counted per"""
+
+    #: One bucket for everyone
+    default = 0
+    #: One bucket per user
+    user = 1
+    #: One bucket per guild, per user in DMs
+    guild = 2
+    #: One bucket per channel
+    channel = 3
+
+    def get_key(self, interaction) -> int:
+        """Gives the bucket key of an interaction
+
+        Parameters
+        -----------
+        interaction: :class:`~discord.Interaction`
+            The interaction
+
+        Returns
+        ---------
+        :class:`~int`
+            The key"""
+        if self is BucketType.user:
+            return interaction.user.id
+        if self is BucketType.guild:
+            return interaction.guild_id or interaction.user.id
+        if self is BucketType.channel:
+            return interaction.channel_id
+        return 0
+
+
+class ResponseState(Enum):
+    """Where the response of a :class:`~slash.models.InteractionContext`
+    stands, it decides how the next message is sent"""
+
+    #: Nothing was sent yet, the next message is the reply
+    fresh = "fresh"
+    #: The interaction was deferred, the next message edits the loading message
+    deferred = "deferred"
+    #: The interaction was replied to, the next message is a follow-up
+    responded = "responded"
+    #: The response was deleted, the next message is a follow-up
+    deleted = "deleted"
+    #: The token expired, nothing can be sent anymore
+    expired = "expired"
+
+
 class MessageFlags:
     EPHEMERAL = 1 << 6
@@ -26,3 +26,37 @@ class LoadFailed(Error):
 class ExtensionNotLoaded(Error):
 	""" Fired when the Extension couldn't be loaded """
 	pass
+
+
+class CommandOnCooldown(Error):
+	""" Fired when a command is used while it is on cooldown """
+	def __init__(self, cooldown, retry_after: float):
+		self.cooldown = cooldown
+		self.retry_after = retry_after
+		super().__init__(f"This command is on cooldown, try again in {retry_after:.1f}s.")
+
+class MaxConcurrencyReached(Error):
+	""" Fired when a command is already running as many times as allowed """
+	def __init__(self, number: int, per):
+		self.number = number
+		self.per = per
+		super().__init__(f"This command can only be used {number} time(s) at once per {per.name}, try again later.")
+
+class InteractionExpired(Error):
+	""" Fired when a message is sent for an interaction which can not be responded to anymore """
+	def __init__(self, context):
+		self.context = context
+		super().__init__("This interaction expired, it can not be responded to anymore.")
+
+class ResponseDeleted(Error):
+	""" Fired when the response of an interaction is edited after it was deleted """
+	def __init__(self, context):
+		self.context = context
+		super().__init__("The response of this interaction was deleted, it can not be edited anymore.")
+
+class BadChoice(Error):
+	""" Fired when the value of an option completed by a ChoiceProvider is not one of its choices """
+	def __init__(self, provider, value):
+		self.provider = provider
+		self.value = value
+		super().__init__(f"'{value}' is not a valid choice, pick one of the suggestions.")
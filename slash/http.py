@@ -0,0 +1,371 @@
+import time
+import random
+import asyncio
+import aiohttp
+import discord
+
+from collections import Counter
+from typing import Any, Dict, Hashable, Optional
+from urllib.parse import quote
+
+
+__all__ = (
+    "InteractionHTTP",
+    "InteractionRoute"
+)
+
+# the lifetime of an interaction token and of its initial response
+TOKEN_LIFETIME = 15 * 60
+CALLBACK_WINDOW = 3.0
+
+
+class InteractionRoute:
+    """An interaction or webhook endpoint
+
+    Parameters
+    ------------
+    method: :class:`~str`
+        The http method
+    path: :class:`~str`
+        The path with ``{param}`` placeholders
+    **params
+        The values of the placeholders
+    """
+    BASE = "https://discord.com/api/v9"
+
+    def __init__(self, method: str, path: str, **params: Any) -> None:
+        self.method = method
+        self.path = path
+        self.url = self.BASE + path.format(**{k: quote(str(v), safe="@") for k, v in params.items()})
+        # discord buckets a route per interaction or per webhook and token
+        self.key: Hashable = (method, path, params.get("interaction_id"),
+                              params.get("webhook_id"), params.get("token"))
+
+    def __repr__(self):
+        return f"<InteractionRoute {self.method} {self.path}>"
+
+
+class _Bucket:
+    __slots__ = ("lock", "remaining", "reset_at", "used")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.used: float = time.monotonic()
+
+
+class InteractionHTTP:
+    """Sends the interaction responses, follow-ups and edits of a
+    :class:`~slash.client.SlashClient` with discord's rate limits
+
+    Requests are queued per rate limit bucket, a bucket is learned from the
+    ``X-RateLimit-*`` headers and waits for its reset once it is exhausted.
+    A global rate limit pauses every request. 429s, 5xx and connection
+    errors are retried with jittered exponential backoff as long as the
+    retry can still finish before the deadline of the request, which is the
+    lifetime of the interaction token unless given. Responses and follow-ups
+    are POSTs which are not safe to send twice, they are only retried after
+    a 429 or when the connection could not be opened.
+
+    Requests are sent with an own session, created on the first request and
+    kept until :meth:`close`, so responses never wait for a connection used
+    by other REST requests of the bot.
+
+    Parameters
+    ------------
+    client: Optional[:class:`~slash.client.SlashClient`]
+        The slashclient, set by the slashclient if it is given there
+    max_retries: :class:`~int`
+        Number of times a request is retried, defaults to 5
+    pool_size: :class:`~int`
+        Maximum number of open connections, defaults to 100
+    keepalive: :class:`~float`
+        Seconds an idle connection is kept open, defaults to 30
+    dns_ttl: Optional[:class:`~int`]
+        Seconds a resolved address is cached, None caches it forever and 0
+        disables the cache, defaults to 300
+    timeout: :class:`~float`
+        Seconds a request may take, including the wait for a connection, defaults to 10
+    connect_timeout: :class:`~float`
+        Seconds opening a connection may take, defaults to 5
+
+    **Attributes**
+
+    Attributes
+    ------------
+    counters: :class:`~collections.Counter`
+        Number of ``"requests"``, ``"retries"``, ``"rate_limited"`` (429s),
+        ``"global"`` (global 429s), ``"server_errors"``, ``"connections"``
+        (opened), ``"reused"`` (keep-alive hits) and ``"queued"`` (requests
+        which waited for a free connection)
+    """
+    # seconds of the first backoff and the cap of every later one
+    BACKOFF = 0.5
+    MAX_BACKOFF = 8.0
+    # buckets unused for this long are forgotten
+    BUCKET_TTL = TOKEN_LIFETIME
+
+    def __init__(self,
+                 client=None,
+                 max_retries: int = 5,
+                 *,
+                 pool_size: int = 100,
+                 keepalive: float = 30.0,
+                 dns_ttl: Optional[int] = 300,
+                 timeout: float = 10.0,
+                 connect_timeout: float = 5.0) -> None:
+        self.client = client
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.counters: Counter = Counter()
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        # created in the running loop, on 3.8 and 3.9 an event binds to the loop of its creation
+        self._global_over: Optional[asyncio.Event] = None
+        self._last_sweep = time.monotonic()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._in_flight: int = 0
+        self._waiting: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+
+    def __repr__(self):
+        return f"<InteractionHTTP buckets={len(self._buckets)} in_flight={self._in_flight}>"
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The session requests are sent with"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size,
+                                             keepalive_timeout=self.keepalive,
+                                             use_dns_cache=self.dns_ttl != 0,
+                                             ttl_dns_cache=self.dns_ttl or None)
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_queued_start.append(self._queued_start)
+            trace.on_connection_queued_end.append(self._queued_end)
+            trace.on_connection_create_end.append(self._connection_created)
+            trace.on_connection_reuseconn.append(self._connection_reused)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+                headers={"User-Agent": self.client.bot.http.user_agent},
+                trace_configs=[trace])
+        return self._session
+
+    async def _queued_start(self, session, context, params):
+        context.queued_at = time.monotonic()
+        self._waiting += 1
+        self.counters["queued"] += 1
+
+    async def _queued_end(self, session, context, params):
+        waited = time.monotonic() - context.queued_at
+        self._waiting -= 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    async def _connection_created(self, session, context, params):
+        self.counters["connections"] += 1
+
+    async def _connection_reused(self, session, context, params):
+        self.counters["reused"] += 1
+
+    async def close(self):
+        """Closes the session, a later request opens a new one"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _bucket(self, key: Hashable) -> _Bucket:
+        now = time.monotonic()
+        if now - self._last_sweep > 60:
+            self._last_sweep = now
+            for k in [k for k, b in self._buckets.items()
+                      if now - b.used > self.BUCKET_TTL and not b.lock.locked()]:
+                del self._buckets[k]
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        bucket.used = now
+        return bucket
+
+    def _global(self) -> asyncio.Event:
+        if self._global_over is None:
+            self._global_over = asyncio.Event()
+            self._global_over.set()
+        return self._global_over
+
+    def _backoff(self, attempt: int) -> float:
+        return min(self.MAX_BACKOFF, self.BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def _read(self, response: aiohttp.ClientResponse) -> Any:
+        if response.status == 204:
+            return None
+        if response.content_type == "application/json":
+            return self.client.codec.loads(await response.read())
+        return await response.text()
+
+    async def request(self, route: InteractionRoute, json: Any = None, *,
+                      body: Optional[bytes] = None, deadline: Optional[float] = None) -> Any:
+        """Sends a request
+
+        Parameters
+        ------------
+        route: :class:`InteractionRoute`
+            The endpoint
+        json: Any
+            The json body, encoded once with the codec of the client, (optional)
+        body: Optional[:class:`~bytes`]
+            The already encoded json body, used instead of ``json``, (optional)
+        deadline: Optional[:class:`~float`]
+            :func:`time.monotonic` time after which retrying is pointless,
+            defaults to the lifetime of a new interaction token
+
+        Raises
+        -------
+        :exc:`~discord.HTTPException`
+            The request failed, :exc:`~discord.Forbidden` and
+            :exc:`~discord.NotFound` for 403 and 404
+
+        Returns
+        --------
+        Any
+            The json of the response, None if it has no content"""
+        if deadline is None:
+            deadline = time.monotonic() + TOKEN_LIFETIME
+        if body is None and json is not None:
+            body = self.client.codec.dumps(json)
+        headers = {"Content-Type": "application/json"} if body is not None else None
+        bucket = self._bucket(route.key)
+        # a POST which may have reached discord is not sent again, it would answer or post twice
+        idempotent = route.method != "POST"
+        global_over = self._global()
+
+        async with bucket.lock:
+            for attempt in range(self.max_retries + 1):
+                now = time.monotonic()
+                if bucket.remaining == 0 and bucket.reset_at > now:
+                    await asyncio.sleep(bucket.reset_at - now)
+                await global_over.wait()
+
+                self.counters["requests"] += 1
+                self._in_flight += 1
+                try:
+                    async with self.session.request(route.method, route.url, data=body,
+                                                    headers=headers) as response:
+                        self.client.log(f"{route.method} {route.path} - {response.status}")
+                        data = await self._read(response)
+                        self._update(bucket, response)
+
+                        if 200 <= response.status < 300:
+                            return data
+
+                        if response.status == 429:
+                            self.counters["rate_limited"] += 1
+                            if not isinstance(data, dict):
+                                # a 429 from the proxy in front of the api has no json
+                                data = {"retry_after": response.headers.get("Retry-After", 1.0)}
+                            delay = float(data.get("retry_after", 1.0))
+                            if data.get("global"):
+                                self.counters["global"] += 1
+                                global_over.clear()
+                                asyncio.get_running_loop().call_later(delay, global_over.set)
+                        elif response.status >= 500:
+                            self.counters["server_errors"] += 1
+                            if not idempotent:
+                                raise discord.DiscordServerError(response, data)
+                            delay = self._backoff(attempt)
+                        elif response.status == 403:
+                            raise discord.Forbidden(response, data)
+                        elif response.status == 404:
+                            raise discord.NotFound(response, data)
+                        else:
+                            raise discord.HTTPException(response, data)
+
+                        if attempt == self.max_retries or time.monotonic() + delay >= deadline:
+                            if response.status >= 500:
+                                raise discord.DiscordServerError(response, data)
+                            raise discord.HTTPException(response, data)
+                except (aiohttp.ClientOSError, asyncio.TimeoutError) as error:
+                    if not idempotent and not isinstance(error, aiohttp.ClientConnectorError):
+                        raise
+                    delay = self._backoff(attempt)
+                    if attempt == self.max_retries or time.monotonic() + delay >= deadline:
+                        raise
+                finally:
+                    self._in_flight -= 1
+
+                self.counters["retries"] += 1
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _update(bucket: _Bucket, response: aiohttp.ClientResponse):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is not None:
+            bucket.remaining = int(remaining)
+        if reset_after is not None:
+            bucket.reset_at = time.monotonic() + float(reset_after)
+
+    def callback(self, interaction_id: int, token: str, payload: Optional[dict] = None, *,
+                 body: Optional[bytes] = None, deadline: Optional[float] = None,
+                 with_response: bool = False):
+        """Sends the initial response of an interaction, by default it is not
+        retried after discord's 3 seconds to respond
+
+        With ``with_response`` discord answers with the interaction and the
+        sent message under ``"resource"`` instead of no content."""
+        if deadline is None:
+            deadline = time.monotonic() + CALLBACK_WINDOW
+        path = "/interactions/{interaction_id}/{token}/callback"
+        if with_response:
+            path += "?with_response=true"
+        route = InteractionRoute("POST", path, interaction_id=interaction_id, token=token)
+        return self.request(route, payload, body=body, deadline=deadline)
+
+    def create_followup(self, application_id: int, token: str, payload: Optional[dict] = None, *,
+                        body: Optional[bytes] = None, deadline: Optional[float] = None):
+        """Sends a follow-up message"""
+        route = InteractionRoute("POST", "/webhooks/{webhook_id}/{token}",
+                                 webhook_id=application_id, token=token)
+        return self.request(route, payload, body=body, deadline=deadline)
+
+    def edit_message(self, application_id: int, token: str, payload: Optional[dict] = None,
+                     message_id: str = "@original", *, body: Optional[bytes] = None,
+                     deadline: Optional[float] = None):
+        """Edits the initial response or a follow-up message"""
+        route = InteractionRoute("PATCH", "/webhooks/{webhook_id}/{token}/messages/{message_id}",
+                                 webhook_id=application_id, token=token, message_id=message_id)
+        return self.request(route, payload, body=body, deadline=deadline)
+
+    def get_message(self, application_id: int, token: str,
+                    message_id: str = "@original", *, deadline: Optional[float] = None):
+        """Fetches the initial response or a follow-up message"""
+        route = InteractionRoute("GET", "/webhooks/{webhook_id}/{token}/messages/{message_id}",
+                                 webhook_id=application_id, token=token, message_id=message_id)
+        return self.request(route, deadline=deadline)
+
+    def delete_message(self, application_id: int, token: str,
+                       message_id: str = "@original", *, deadline: Optional[float] = None):
+        """Deletes the initial response or a follow-up message"""
+        route = InteractionRoute("DELETE", "/webhooks/{webhook_id}/{token}/messages/{message_id}",
+                                 webhook_id=application_id, token=token, message_id=message_id)
+        return self.request(route, deadline=deadline)
+
+    def stats(self) -> Dict[str, Any]:
+        """Gives the counters, the number of known buckets and how saturated
+        the connection pool is"""
+        queued = self.counters["queued"]
+        return {
+            **self.counters,
+            "buckets": len(self._buckets),
+            "pool_size": self.pool_size,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "wait_avg": self._wait_total / queued if queued else 0.0,
+            "wait_max": self._wait_max
+        }
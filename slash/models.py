@@ -1,4 +1,4 @@
-import copy
+import time
 import typing
 import discord
 import asyncio
@@ -6,13 +6,18 @@ import inspect
 import functools
 
 from .types import SlashClient
-from .enums import OptionType
+from .enums import OptionType, ResponseState
+from .exceptions import CommandNotRegistered, InteractionExpired, ResponseDeleted
+from .cooldowns import Cooldown, MaxConcurrency
+from .resolver import EntityFetcher, Missing, ResolvedData
+from .http import CALLBACK_WINDOW, TOKEN_LIFETIME
+from .responses import PreparedResponse
+from .editor import CoalescingEditor
 
 from discord import ui
 from discord import http
 from discord.ext import commands
-from aiohttp.client import ClientSession
-from typing import Dict, List, Union, Optional, Coroutine, Callable
+from typing import Dict, FrozenSet, List, Tuple, Union, Optional, Coroutine, Callable
 
 
 __all__ = (
@@ -21,33 +26,148 @@ __all__ = (
     "InteractionContext",
     "InteractionData",
     "Option",
-    "SlashCommand"
+    "SlashCommand",
+    "SubCommand",
+    "SubCommandGroup"
 )
 
-async def get_ctx_kw(ctx, params):
-    bot, cmd, kwargs = ctx.bot, ctx.command, {}
-    if cmd is not None and len(ctx.data.options) > 0:
-        for k, _ in params.items():
-            for opt in ctx.data.options:    
-                if k == opt.name:
-                    if opt.type == OptionType.USER:
-                        if ctx.guild:
-                            value = ctx.guild.get_member(opt.value) or await ctx.guild.fetch_member(opt.value)
-                        else:
-                            value = bot.get_user(opt.value) or await bot.fetch_user(opt.value)
-                    elif opt.type == OptionType.CHANNEL:
-                        if ctx.guild:
-                            value = ctx.guild.get_channel(opt.value) or await ctx.guild.fetch_channel(opt.value)
-                        else:
-                            value = bot.get_channel(opt.value) or await bot.fetch_channel(opt.value)
-                    elif opt.type == OptionType.ROLE:
-                        value = ctx.guild.get_role(opt.value)
-                    elif opt.type == OptionType.MENTIONABLE:
-                        value = discord.Object(opt.value)
-                    else:
-                        value = opt.value
-                    kwargs[k] = value
-    return kwargs
+def _lookup(ctx, cached, resolve: Optional[Callable] = None, missing: Optional[Missing] = None):
+    # discord.py's cache, then what discord just sent, then the fetched entities which
+    # can be up to their ttl old, the resolved entity is only built when the cache misses
+    stats = ctx.client.resolve_stats
+    if cached is not None:
+        stats["cache"] += 1
+        return cached
+    resolved = resolve() if resolve is not None else None
+    if resolved is not None:
+        stats["resolved"] += 1
+        return resolved
+    if missing is not None:
+        cached = ctx.client.entity_cache.get(missing.key(ctx.guild))
+        if cached is not None:
+            stats["cache"] += 1
+            return cached
+    return missing
+
+def _convert_user(ctx, value):
+    value = int(value)
+    resolve = lambda: ctx.resolved.user(value)
+    if ctx.guild:
+        return _lookup(ctx, ctx.guild.get_member(value), resolve, Missing("member", value))
+    return _lookup(ctx, ctx.bot.get_user(value), resolve, Missing("user", value))
+
+def _convert_channel(ctx, value):
+    value = int(value)
+    cached = ctx.guild.get_channel(value) if ctx.guild else ctx.bot.get_channel(value)
+    return _lookup(ctx, cached, lambda: ctx.resolved.channel(value), Missing("channel", value))
+
+def _convert_role(ctx, value):
+    value = int(value)
+    cached = ctx.guild.get_role(value) if ctx.guild else None
+    return _lookup(ctx, cached, lambda: ctx.resolved.role(value))
+
+def _convert_mentionable(ctx, value):
+    value = int(value)
+    cached = (ctx.guild.get_member(value) or ctx.guild.get_role(value)) if ctx.guild else ctx.bot.get_user(value)
+    return _lookup(ctx, cached, lambda: ctx.resolved.mentionable(value)) or discord.Object(value)
+
+_CONVERTERS = {
+    OptionType.USER: _convert_user,
+    OptionType.CHANNEL: _convert_channel,
+    OptionType.ROLE: _convert_role,
+    OptionType.MENTIONABLE: _convert_mentionable
+}
+
+
+class ArgumentBinder:
+    """The binding plan of a command callback, built once when the
+    command is created so dispatching an interaction is a single pass
+    over its options
+
+    Parameters
+    ------------
+    params: Dict[:class:`~str`, :class:`~inspect.Parameter`]
+        The signature parameters of the callback
+    options: List[:class:`~slash.models.Option`]
+        The options of the command
+    """
+    __slots__ = ("cog_slot", "ctx_slot", "plain_ctx_slot", "slots", "optional")
+
+    def __init__(self, params: Dict[str, inspect.Parameter], options: List['Option']) -> None:
+        names = list(params)
+        self.cog_slot: Optional[str] = names[0] if names and names[0] in ("cls", "self") else None
+        self.ctx_slot: Optional[str] = names[1] if self.cog_slot and len(names) > 1 else None
+        self.plain_ctx_slot: Optional[str] = names[0] if names else None
+
+        by_name = {o.name: o for o in options if isinstance(o, Option)}
+        self.slots: Dict[str, Optional[Callable]] = {
+            name: self._converter(by_name.get(name)) for name in names[1:] if name != self.ctx_slot
+        }
+        # an entity of these which can't be fetched leaves the default of its parameter
+        self.optional: FrozenSet[str] = frozenset(o.name for o in by_name.values() if not o.required)
+
+    @staticmethod
+    def _converter(option: Optional['Option']) -> Optional[Callable]:
+        if option is None:
+            return None
+        # a ChoiceProvider maps the value back to its entry
+        return getattr(option.autocomplete, "_convert", None) or _CONVERTERS.get(option.type)
+
+    def __repr__(self):
+        return f"<ArgumentBinder ctx={self.ctx_slot or self.plain_ctx_slot} slots={list(self.slots)}>"
+
+    def bind_context(self, ctx: 'InteractionContext', cog) -> dict:
+        """Gives the keyword arguments for the cog and the context only"""
+        if cog and self.ctx_slot:
+            return {self.cog_slot: cog, self.ctx_slot: ctx}
+        return {self.plain_ctx_slot: ctx}
+
+    async def bind(self,
+                   ctx: 'InteractionContext',
+                   cog,
+                   options: List['Option'],
+                   fetcher: Optional[EntityFetcher] = None) -> dict:
+        """Builds the keyword arguments of the callback
+
+        Entities which are neither cached nor resolved are fetched
+        concurrently once every option is converted, a failed fetch of an
+        optional option leaves the default of its parameter.
+
+        Parameters
+        ------------
+        ctx: :class:`~slash.models.InteractionContext`
+            The context of the interaction
+        cog: Optional[:class:`~discord.ext.commands.Cog`]
+            The cog of the command, if any
+        options: List[:class:`~slash.models.Option`]
+            The options given in the interaction
+        fetcher: Optional[:class:`~slash.resolver.EntityFetcher`]
+            Collects the fetches instead, the caller has to run it
+
+        Returns
+        --------
+        :class:`~dict`
+            The keyword arguments"""
+        kwargs = self.bind_context(ctx, cog)
+        own = fetcher is None
+        if own:
+            fetcher = EntityFetcher(ctx.client, ctx.guild)
+
+        slots = self.slots
+        for opt in options:
+            if opt.name not in slots:
+                continue
+            convert = slots[opt.name]
+            value = opt.value if convert is None else convert(ctx, opt.value)
+            if isinstance(value, Missing):
+                fetcher.want(value, functools.partial(kwargs.__setitem__, opt.name),
+                             required=opt.name not in self.optional)
+            else:
+                kwargs[opt.name] = value
+
+        if own:
+            await fetcher.run()
+        return kwargs
 
 def unwrap_function(function):
     partial = functools.partial
@@ -129,67 +249,162 @@ class InteractionContext:
         Interaction type 
     guild: Union[:class:`~discord.Guild`, None]
         The guild in which command is fired, None if it is in DMs 
-    channel: Union[:class:`~discord.TextChannel`, :class:`~discord.DMChannel`]
-        The channel in which command is triggered
+    channel_id: Optional[:class:`~int`]
+        id of the channel in which command is triggered
     id: :class:`~int`
         id of this interaction
     user: Union[:class:`~discord.User`, :class:`~discord.Member`]
         The user who fired this cmd 
     token: :class:`~str`
-        token of this interaction, (valid for 15 mins)"""
+        token of this interaction, (valid for 15 mins)
+    subcommand: Optional[:class:`~slash.models.SubCommand`]
+        The invoked subcommand, None if the command itself was invoked"""
     def __init__(self, bot: commands.Bot, client: SlashClient) -> None:
         self.bot: commands.Bot = bot
         self.client: SlashClient = client
-        self.__session: ClientSession = self.bot.http._HTTPClient__session
         self.version: int = None
         self.type: int = None
         self.token: str = None
         self.id: int = None
-        self.data: InteractionData = None
         self.application_id: int = None
         self.user: Union[discord.Member, discord.User] = None
-        self.channel: discord.TextChannel = None
         self.guild: discord.Guild = None
+        self.channel_id: Optional[int] = None
+        self.command: Optional['SlashCommand'] = None
+        self.subcommand: Optional['SubCommand'] = None
         self.kwargs: dict = {}
+        self._raw_data: dict = {}
+        self._data: Optional[InteractionData] = None
+        self._resolved: Optional[ResolvedData] = None
+        self._channel = None
+        self._partial_channel = None
+        self._response_lock = asyncio.Lock()
+        self._received: float = time.monotonic()
+        self._state: ResponseState = ResponseState.fresh
+        self._original: Optional[discord.Message] = None
+
+    @property
+    def _expires(self) -> float:
+        return self._received + TOKEN_LIFETIME
+
+    @property
+    def state(self) -> ResponseState:
+        """Where the response stands, expired once the token expired or when
+        nothing was sent within discord's 3 seconds to respond"""
+        if self._state is not ResponseState.expired:
+            now = time.monotonic()
+            if now >= self._expires or (self._state is ResponseState.fresh
+                                        and now >= self._received + CALLBACK_WINDOW):
+                self._state = ResponseState.expired
+        return self._state
+
+    @property
+    def responded(self) -> bool:
+        """Whether the interaction was replied to or deferred"""
+        return self._state in (ResponseState.deferred, ResponseState.responded, ResponseState.deleted)
+
+    @property
+    def data(self) -> 'InteractionData':
+        """The data of the interaction, parsed on first access"""
+        if self._data is None:
+            self._data = InteractionData.from_dict(self._raw_data)
+        return self._data
+
+    @data.setter
+    def data(self, value: 'InteractionData'):
+        self._data = value
+
+    @property
+    def resolved(self) -> ResolvedData:
+        """The users, members, roles and channels sent with the interaction,
+        built on first access"""
+        if self._resolved is None:
+            self._resolved = ResolvedData(self.bot._connection, self.guild, self._raw_data.get('resolved'))
+        return self._resolved
+
+    @property
+    def channel(self) -> Optional[Union[discord.abc.GuildChannel, discord.abc.PrivateChannel, 'discord.PartialMessageable']]:
+        """The channel in which command is triggered
+
+        Only caches are looked in, a partial channel is given when it is not
+        cached, use :meth:`fetch_channel` to get the full channel."""
+        if self._channel is None and self.channel_id is not None:
+            if self._partial_channel is not None:
+                # looked up and counted once, the partial is kept
+                return self._partial_channel
+            if self.guild:
+                cached = self.guild.get_channel(self.channel_id)
+            else:
+                cached = self.user.dm_channel or self.bot.get_channel(self.channel_id)
+            cached = _lookup(self, cached, None, Missing("channel", self.channel_id))
+            if not isinstance(cached, Missing):
+                self._channel = cached
+            elif hasattr(self.bot, "get_partial_messageable"):
+                self._partial_channel = self.bot.get_partial_messageable(self.channel_id)
+                return self._partial_channel
+        return self._channel
+
+    @channel.setter
+    def channel(self, value):
+        self._channel = value
+
+    async def fetch_channel(self) -> Union[discord.abc.GuildChannel, discord.abc.PrivateChannel]:
+        """Gives the full channel in which command is triggered, it is
+        fetched once if it is not cached"""
+        channel = self.channel
+        if self._channel is None and self.channel_id is not None:
+            fetcher = EntityFetcher(self.client, self.guild)
+            fetcher.want(Missing("channel", self.channel_id), functools.partial(setattr, self, "channel"))
+            await fetcher.run()
+            channel = self._channel
+        return channel
+
+    async def from_interaction(self, interaction, command: Optional['SlashCommand'] = None) -> 'InteractionContext':
+        """Fills the context from an interaction, only what the signature of
+        the callback needs is resolved, everything else on first access"""
+        self._prepare(interaction, command)
+        if not await self._bind():
+            raise CommandNotRegistered(f"'{' '.join((self.command.name, *self.data.path))}' has no callback")
+        return self
 
-    async def from_interaction(self, interaction) -> 'InteractionContext':
+    def _prepare(self, interaction, command: Optional['SlashCommand'] = None) -> 'InteractionContext':
+        self._received = time.monotonic()
         self.version = interaction.version
         self.type = interaction.type
         self.token = interaction.token
         self.id = interaction.id
-        self.data = InteractionData.from_dict(interaction.data)
-        cmd = self.bot.slashclient.commands.get(self.data.id, None)['command']
-        self.command = cmd
-        params = copy.deepcopy(cmd.params)
-        if cmd.cog and str(list(params.keys())[0]) in ("cls", "self"): # cls/self only
-            self.kwargs[str(params.pop(list(params.keys())[0]))] = cmd.cog
-        self.kwargs[str(params.pop(list(params.keys())[0]))] = self
+        self._raw_data = interaction.data
+        if command is None and interaction.data.get('id'):
+            command = self.bot.slashclient.commands.get(int(interaction.data['id']), None)['command']
+        self.command = command
         self.application_id = interaction.application_id
         self.user = interaction.user
+        self.channel_id = interaction.channel_id
         self.guild = None
 
         if isinstance(interaction.user, discord.Member):
             self.guild = self.user.guild
-
-        if interaction.channel_id is not None and self.guild:
-            self.channel = self.guild.get_channel(
-                interaction.channel_id) or await self.guild.fetch_channel(
-                    interaction.channel_id)
-        elif interaction.channel_id is not None:
-            self.channel = await self.user._get_channel()
-
-        self.kwargs = {**self.kwargs, **(await get_ctx_kw(self, params))}
         return self
 
-    async def reply(self,
-                    content: str = None,
-                    *,
-                    tts: bool = False,
-                    embed: discord.Embed = None,
-                    allowed_mentions=None,
-                    ephemeral: bool = False,
-                    view: ui.View = None):
-        """Replies to given interaction"""
+    async def _bind(self) -> bool:
+        # False when nothing can be called, a subcommand unknown to this version of
+        # the command or a command made without a callback
+        cmd = target = self.command
+        if cmd._routes:
+            self.subcommand = cmd._routes.get(self.data.path)
+            target = self.subcommand or cmd
+
+        binder = target._binder
+        if binder is None:
+            return False
+        if binder.slots and self._raw_data.get('options'):
+            self.kwargs = await binder.bind(self, cmd.cog, self.data.options)
+        else:
+            self.kwargs = binder.bind_context(self, cmd.cog)
+        return True
+
+    def _payload(self, content: Optional[str], embed: Optional[discord.Embed],
+                 view: Optional[ui.View], ephemeral: bool = False) -> dict:
         ret = {
             "content": content,
         }
@@ -202,18 +417,82 @@ class InteractionContext:
 
         if view:
             ret["components"] = view.to_components()
-            for i in view.children:
-                if i._provided_custom_id:
-                    self.client._views[i.custom_id] = [view, i]
-
-        url = f"https://discord.com/api/v9/interactions/{self.id}/{self.token}/callback"
+            self.client.views.add(view)
+        return ret
 
-        json = {"type": 4, "data": ret}
+    def _message(self, data: Optional[dict]) -> Optional[discord.Message]:
+        if not data:
+            return None
+        return discord.Message(state=self.bot._connection, channel=self.channel, data=data)
+
+    async def _send(self, payload: Optional[dict] = None, *, prepared: Optional[PreparedResponse] = None,
+                    values: Optional[dict] = None, view: Optional[ui.View] = None,
+                    edit: bool = False) -> Optional[discord.Message]:
+        # the route follows the state: the callback while fresh, the edit of the
+        # loading message once deferred and a follow-up once replied or deleted,
+        # unless `edit` asks for the edit of the reply
+        http = self.client.interaction_http
+        async with self._response_lock:
+            state = self.state
+            if state is ResponseState.expired:
+                raise InteractionExpired(self)
+
+            if state is ResponseState.fresh:
+                if prepared is not None:
+                    body = prepared._render(self.client.codec, values, True)
+                    data = await http.callback(self.id, self.token, body=b'{"type":4,"data":' + body + b'}',
+                                               deadline=self._received + CALLBACK_WINDOW, with_response=True)
+                else:
+                    data = await http.callback(self.id, self.token, {"type": 4, "data": payload},
+                                               deadline=self._received + CALLBACK_WINDOW, with_response=True)
+                self._state = ResponseState.responded
+                message = self._original = self._message((data or {}).get("resource", {}).get("message"))
+            else:
+                if edit and state is ResponseState.deleted:
+                    raise ResponseDeleted(self)
+
+                if edit or state is ResponseState.deferred:
+                    # edits take no flags
+                    body = prepared._render(self.client.codec, values, False) if prepared is not None else None
+                    if payload is not None:
+                        payload.pop("flags", None)
+                    data = await http.edit_message(self.application_id, self.token, payload,
+                                                   body=body, deadline=self._expires)
+                    message = self._original = self._message(data)
+                else:
+                    body = prepared._render(self.client.codec, values, True) if prepared is not None else None
+                    data = await http.create_followup(self.application_id, self.token, payload,
+                                                      body=body, deadline=self._expires)
+                    message = self._message(data)
+                if state is not ResponseState.deleted:
+                    self._state = ResponseState.responded
 
-        async with self.__session.request('POST', url, json = json) as response:
-            self.client.log(f"Reply response - {response.status}")
+        if view is not None and message is not None:
+            self.client.views.bind(view, message.id)
+        return message
 
-            return response.text
+    async def reply(self,
+                    content: str = None,
+                    *,
+                    tts: bool = False,
+                    embed: discord.Embed = None,
+                    allowed_mentions=None,
+                    ephemeral: bool = False,
+                    view: ui.View = None) -> Optional[discord.Message]:
+        """Responds to the interaction the way its :attr:`state` allows, with
+        the reply, the edit of the deferred response or a follow-up if it
+        was replied to already or the response was deleted
+
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore, nothing was sent
+
+        Returns
+        --------
+        Optional[:class:`~discord.Message`]
+            The sent message"""
+        return await self._send(self._payload(content, embed, view, ephemeral), view=view)
 
     async def follow(self,
                      content: str = None,
@@ -222,30 +501,20 @@ class InteractionContext:
                      embed: discord.Embed = None,
                      allowed_mentions=None,
                      ephemeral: bool = False,
-                     view: ui.View = None):
-        """Sends a follow-up message."""
-        ret = {
-            "content": content,
-        }
+                     view: ui.View = None) -> Optional[discord.Message]:
+        """Sends a follow-up message, it is sent as the reply if the
+        interaction was not responded to yet
 
-        if ephemeral:
-            ret["flags"] = 64
-
-        if embed:
-            ret["embeds"] = [embed.to_dict()]
-
-        if view:
-            ret["components"] = view.to_components()
-            for i in view.children:
-                if i._provided_custom_id:
-                    self.client._views[i.custom_id] = [view, i]
-
-        url = f"https://discord.com/api/v9/webhooks/{self.application_id}/{self.token}"
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore, nothing was sent
 
-        async with self.__session.request('POST', url, json = ret) as response:
-            self.client.log(f"Follow msg response - {response.status}")
-
-            return response.text
+        Returns
+        --------
+        Optional[:class:`~discord.Message`]
+            The sent message"""
+        return await self._send(self._payload(content, embed, view, ephemeral), view=view)
 
     async def edit(self,
                    content: str = None,
@@ -253,46 +522,134 @@ class InteractionContext:
                    tts: bool = False,
                    embed: discord.Embed = None,
                    allowed_mentions=None,
-                   view: ui.View = None):
-        """edit the responded msg"""
-        ret = {
-            "content": content,
-        }
-
-        if embed:
-            ret["embeds"] = [embed.to_dict()]
-
-        if view:
-            ret["components"] = view.to_components()
-            for i in view.children:
-                if i._provided_custom_id:
-                    self.client._views[i.custom_id] = [view, i]
-
-        url = f"https://discord.com/api/v9/webhooks/{self.application_id}/{self.token}/messages/@original"
-
-        async with self.__session.request('PATCH', url, json = ret) as response:
-            self.client.log(f"Reply edit response - {response.status}")
+                   view: ui.View = None) -> Optional[discord.Message]:
+        """Edits the response, it is sent as the reply if the interaction was
+        not responded to yet
+
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore, nothing was sent
+        :exc:`~slash.exceptions.ResponseDeleted`
+            The response was deleted, nothing was sent
+
+        Returns
+        --------
+        Optional[:class:`~discord.Message`]
+            The edited message"""
+        return await self._send(self._payload(content, embed, view), view=view, edit=True)
+
+    async def respond(self, prepared: PreparedResponse, **values) -> Optional[discord.Message]:
+        """Sends a :class:`~slash.responses.PreparedResponse` as its encoded bytes, routed
+        like :meth:`reply`
+
+        Parameters
+        ------------
+        prepared: :class:`~slash.responses.PreparedResponse`
+            The message
+        **values
+            The values of its slots
+
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore, nothing was sent
+
+        Returns
+        --------
+        Optional[:class:`~discord.Message`]
+            The sent message"""
+        prepared._check(values)
+        view = prepared.view() if prepared.view is not None else None
+        if view is not None:
+            self.client.views.add(view)
+        return await self._send(prepared=prepared, values=values, view=view)
+
+    def editor(self, interval: float = 1.0) -> CoalescingEditor:
+        """Gives an editor which coalesces rapid edits of the response, see
+        :class:`~slash.editor.CoalescingEditor`
+
+        Parameters
+        ------------
+        interval: :class:`~float`
+            Minimum seconds between two edits, defaults to 1"""
+        return CoalescingEditor(self, interval)
+
+    async def original_message(self) -> Optional[discord.Message]:
+        """Gives the reply or the deferred response, as returned by the last
+        reply or edit, it is fetched if it is not known
+
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore
+
+        Returns
+        --------
+        Optional[:class:`~discord.Message`]
+            The message, None if the interaction was not responded to yet
+            or the response was deleted"""
+        state = self.state
+        if state is ResponseState.expired:
+            raise InteractionExpired(self)
+        if state in (ResponseState.fresh, ResponseState.deleted):
+            return None
+        if self._original is None:
+            self._original = self._message(await self.client.interaction_http.get_message(
+                self.application_id, self.token, deadline=self._expires))
+        return self._original
 
     async def delete(self):
-        """Delete the responded msg"""
-        url = f"https://discord.com/api/v9/webhooks/{self.application_id}/{self.token}/messages/@original"
-
-        async with self.__session.request('DELETE', url) as response:
-            self.client.log(f"Delete reply response - {response.status}")
-
-            return response.text
+        """Deletes the response, nothing is sent if the interaction was not
+        responded to yet or the response was deleted already
+
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore"""
+        async with self._response_lock:
+            state = self.state
+            if state is ResponseState.expired:
+                raise InteractionExpired(self)
+            if state in (ResponseState.fresh, ResponseState.deleted):
+                return None
+            await self.client.interaction_http.delete_message(
+                self.application_id, self.token, deadline=self._expires)
+            self._original = None
+            self._state = ResponseState.deleted
 
     async def defer(self, ephemeral: bool = False):
-        """Defers the interaction so discord knows bot has recieved it, this is considered a reply so you must edit it later."""
-        url = f"https://discord.com/api/v9/interactions/{self.id}/{self.token}/callback"
+        """Defers the interaction so discord knows bot has recieved it, this is considered a reply so you must edit it later.
+
+        Nothing is sent if the interaction was responded to already.
+
+        Raises
+        -------
+        :exc:`~slash.exceptions.InteractionExpired`
+            The interaction can not be responded to anymore"""
+        async with self._response_lock:
+            state = self.state
+            if state is ResponseState.expired:
+                raise InteractionExpired(self)
+            if state is ResponseState.fresh:
+                await self._defer(ephemeral)
+
+    async def _auto_defer(self, ephemeral: bool = False) -> bool:
+        async with self._response_lock:
+            if self.state is not ResponseState.fresh:
+                return False
+            await self._defer(ephemeral)
+            return True
+
+    async def _defer(self, ephemeral: bool = False):
         ret = {"type": 5}
         if ephemeral:
             ret["data"] = {"flags": 64}
 
-        async with self.__session.request('POST', url, json=ret) as response:
-            self.client.log(f"Deferred interaction - {response.status}")
-
-            return response.text
+        data = await self.client.interaction_http.callback(
+            self.id, self.token, ret, deadline=self._received + CALLBACK_WINDOW)
+        self._state = ResponseState.deferred
+        return data
 
 class InteractionData:
     """The data given in `ctx.data`
@@ -309,12 +666,19 @@ class InteractionData:
         Id of the command
     options: List[:class:`~slash.models.Option`]
         Options passed in command
+    resolved: :class:`~dict`
+        The raw users, members, roles and channels of the options
+    path: Tuple[:class:`~str`, ...]
+        Names of the invoked subcommand group and subcommand, empty if none
     """
-    def __init__(self, type: int, name: str, _id: int, options: Optional[List['Option']] = None) -> None:
+    def __init__(self, type: int, name: str, _id: int, options: Optional[List['Option']] = None,
+                 resolved: Optional[dict] = None, path: Tuple[str, ...] = ()) -> None:
         self.type = type
         self.name = name
         self.id = int(_id)
         self.options = options
+        self.resolved = resolved or {}
+        self.path = path
 
     def __repr__(self):
         return f"<InteractionData type={self.type} id={self.id} name={self.name} options={self.options}>"
@@ -324,12 +688,15 @@ class InteractionData:
 
     @classmethod
     def from_dict(cls, d: dict) -> 'InteractionData':
-        options = []
-        if d.get('options'):
-            for i in d.get('options'):
-                options.append(Option.from_dict(i))
+        path = []
+        raw = d.get('options') or []
+        # a subcommand (group) is the only option of its level, its own options are nested in it
+        while raw and raw[0]['type'] in (OptionType.SUB_COMMAND, OptionType.SUB_COMMAND_GROUP):
+            path.append(raw[0]['name'])
+            raw = raw[0].get('options') or []
 
-        return cls(d['type'], d['name'], d['id'], options)
+        options = [Option.from_dict(i) for i in raw]
+        return cls(d['type'], d['name'], d['id'], options, d.get('resolved'), tuple(path))
 
 class Choice:
     """Choice for the option value 
@@ -366,6 +733,9 @@ class Option:
         whether the option is required
     choices: Optional[List[:class:`~slash.models.Choice`]]
         The choices for this option
+    autocomplete: Optional[Union[Coroutine, :class:`~slash.choices.ChoiceProvider`]]
+        Called with the interaction and the typed value to give suggestions,
+        usually set with :meth:`SlashCommand.autocomplete`, (optional)
     """
     def __init__(self,
                  name: str,
@@ -373,7 +743,8 @@ class Option:
                  type: Optional[int] = 3,
                  required: Optional[bool] = True,
                  value: str = None,
-                 choices: Optional[List[Choice]] = []):
+                 choices: Optional[List[Choice]] = [],
+                 autocomplete: Optional[Callable] = None):
         if type not in (3, 4, 5, 6, 7, 8, 9, 10):
             raise ValueError(
                 "type should be one of the values (3,4,5,6,7,8,9,10) not {}".
@@ -384,6 +755,8 @@ class Option:
         self.choices = choices
         self.value = value
         self.required = required
+        self.autocomplete = autocomplete
+        self.cache_choices = True
 
     def to_dict(self):
         ret = {
@@ -394,6 +767,8 @@ class Option:
             "required": self.required,
             "value": self.value
         }
+        if self.autocomplete is not None:
+            ret["autocomplete"] = True
         return ret
 
     @classmethod
@@ -413,7 +788,42 @@ class Option:
         return f"<Option name={self.name} description={self.description} type={self.type} required={self.required} value={self.value} choices={self.choices}>"
 
 
+def _autocomplete(command, name: str, cache: bool):
+    option = next((o for o in command.options if isinstance(o, Option) and o.name == name), None)
+    if option is None:
+        raise ValueError(f"'{command.name}' has no option '{name}'")
+    if option.choices:
+        raise ValueError(f"Option '{name}' has choices, it can't be autocompleted")
+
+    def wrapper(func):
+        if not (asyncio.iscoroutinefunction(func) or asyncio.iscoroutinefunction(getattr(func, "__call__", None))):
+            raise TypeError('Callback must be a coroutine.')
+        option.autocomplete = func
+        option.cache_choices = cache
+        if command._binder is not None:
+            command._binder = ArgumentBinder(command.params, command.options)
+        return func
+
+    return wrapper
+
+
 class SubCommand:
+    """A subcommand of a :class:`SlashCommand` or :class:`SubCommandGroup`,
+    usually made with :meth:`SlashCommand.subcommand`
+
+    Parameters
+    ------------
+    client: :class:`~slash.client.SlashClient`
+       Your SlashClient instance, (required)
+    name: :class:`~str`
+       Name of the subcommand, defaults to the callback name
+    description: Optional[:class:`~str`]
+       description of the subcommand, (optional)
+    options: Optional[List[:class:`~slash.models.Option`]]
+       options of the subcommand, detected from the callback if not given, (optional)
+    callback: Optional[Coroutine]
+       the callback which is called with its own options, (optional)
+    """
     def __init__(self,
                  client: SlashClient,
                  name: str = None,
@@ -421,7 +831,9 @@ class SubCommand:
                  options: List[Option] = [],
                  callback=None,
                  parent=None):
-        self.options = options
+        self.options = list(options)
+        self.parent = parent
+        self._binder = None
         if callback is not None:
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
@@ -435,6 +847,7 @@ class SubCommand:
             self.params = get_signature_parameters(callback, globalns)
             if not options:
                 self.options = generate_options(self.callback, description)
+            self._binder = ArgumentBinder(self.params, self.options)
         else:
             if not name:
                 raise ValueError("You must specify name when callback is None")
@@ -443,6 +856,22 @@ class SubCommand:
         self.client = client
         self.description = description
 
+    def __repr__(self):
+        return f"<SubCommand name='{self.name}' description='{self.description}'>"
+
+    def autocomplete(self, name: str, *, cache: bool = True):
+        """Sets the autocomplete handler of an option, same as :meth:`SlashCommand.autocomplete`"""
+        def wrapper(func):
+            handler = _autocomplete(self, name, cache)(func)
+            root = self.parent
+            while root is not None and not isinstance(root, SlashCommand):
+                root = root.parent
+            if root is not None:
+                root._payload_changed()
+            return handler
+
+        return wrapper
+
     def to_dict(self):
         ret = {
             "name": self.name,
@@ -476,6 +905,20 @@ class SubCommand:
 
 
 class SubCommandGroup:
+    """A group of subcommands of a :class:`SlashCommand`, usually made with
+    :meth:`SlashCommand.group`
+
+    Parameters
+    ------------
+    client: :class:`~slash.client.SlashClient`
+       Your SlashClient instance, (required)
+    name: :class:`~str`
+       Name of the group, (required)
+    description: Optional[:class:`~str`]
+       description of the group, (optional)
+    subcommands: Optional[List[:class:`~slash.models.SubCommand`]]
+       the subcommands of the group, (optional)
+    """
     def __init__(self,
                  client: SlashClient,
                  name: str = None,
@@ -483,7 +926,8 @@ class SubCommandGroup:
                  options: List[Option] = [],
                  callback=None,
                  subcommands: List[SubCommand] = []):
-        self.options = options
+        self.options = list(options)
+        self.parent = None
         if callback is not None:
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError('Callback must be a coroutine.')
@@ -505,9 +949,26 @@ class SubCommandGroup:
         self.client = client
         self.description = description
 
-        self.subcommands = subcommands
+        self.subcommands = list(subcommands)
         self.options.extend(self.subcommands)
 
+    def __repr__(self):
+        return f"<SubCommandGroup name='{self.name}' subcommands={[s.name for s in self.subcommands]}>"
+
+    def subcommand(self, name: str = None, description: str = "No description.",
+                   options: List[Option] = []) -> Callable[[Callable], SubCommand]:
+        """Adds a subcommand to the group, same as :meth:`SlashCommand.subcommand`"""
+        def wrapper(func):
+            sub = SubCommand(self.client, name=name, description=description,
+                             options=options, callback=func, parent=self)
+            self.subcommands.append(sub)
+            self.options.append(sub)
+            if self.parent is not None:
+                self.parent._payload_changed()
+            return sub
+
+        return wrapper
+
     def to_dict(self):
         ret = {
             "name": self.name,
@@ -568,24 +1029,38 @@ class SlashCommand:
        options for your command, (optional)
     callback: Optional[Coroutine]
        the callback which is to be called when a command fires, (optional)
+    auto_defer: Optional[:class:`~float`]
+       seconds after which the interaction is deferred if the callback has not
+       responded yet, 0 disables it, defaults to the one of the client, (optional)
+    cooldown: Optional[:class:`~slash.cooldowns.Cooldown`]
+       rate limit of the command, checked before anything is resolved, (optional)
+    max_concurrency: Optional[:class:`~slash.cooldowns.MaxConcurrency`]
+       how many times the command can run at once, (optional)
        
     Raises 
     --------
     TypeError 
         Callback is not coroutine 
     ValueError 
-        Name not given when coroutine not given
+        Name not given when coroutine not given, or options given next to
+        subcommands
     """
     def __init__(self,
                  client: SlashClient,
                  name: str = None,
                  description: Optional[str] = "No description.",
-				 guild: Optional[int] = None,
+                 guild: Optional[int] = None,
                  options: Optional[List[Option]] = [],
                  callback: Optional[Coroutine] = None,
                  subcommands: Optional[List[Union[SubCommandGroup,
-                                                  SubCommand]]] = []) -> None:
-        self.options = options
+                                                  SubCommand]]] = [],
+                 auto_defer: Optional[float] = None,
+                 cooldown: Optional[Cooldown] = None,
+                 max_concurrency: Optional[MaxConcurrency] = None) -> None:
+        self.options = list(options)
+        self.auto_defer = auto_defer
+        self.cooldown = cooldown
+        self.max_concurrency = max_concurrency
         self.client = client
         self.description = description
         self.guild = guild
@@ -604,6 +1079,7 @@ class SlashCommand:
             if not options or options == []:
                 self.options = generate_options(callback, description)
             self.callback = callback
+            self._binder = ArgumentBinder(self.params, self.options)
         elif (hasattr(self, 'callback') and self.callback is not MISSING):
             if not callback:
                 callback = self.callback
@@ -619,15 +1095,156 @@ class SlashCommand:
             self.params = get_signature_parameters(callback, globalns)
             if not options:
                 self.options = generate_options(self.callback, description)
+            self._binder = ArgumentBinder(self.params, self.options)
         else:
             if not name:
                 raise ValueError("You must specify name when callback is None")
             self.name  = name
+            self._binder = None
         self.options.extend(subcommands)
+        self._routes: Dict[Tuple[str, ...], SubCommand] = {}
+        self._build_routes()
 
     def __repr__(self):
         return f"<SlashCommmand name='{self.name}' description='{self.description}'>"
 
+    def _check_nesting(self):
+        # discord rejects a command which has subcommands or groups next to other options
+        own = [o.name for o in self.options if not isinstance(o, (SubCommand, SubCommandGroup))]
+        if own:
+            raise ValueError(f"Command '{self.name}' has subcommands or groups, so it can't have "
+                             f"options of its own, remove {own} from it or from its callback")
+
+    def _build_routes(self):
+        if any(isinstance(o, (SubCommand, SubCommandGroup)) for o in self.options):
+            self._check_nesting()
+        routes = {}
+        for opt in self.options:
+            if isinstance(opt, SubCommand):
+                opt.parent = self
+                routes[(opt.name,)] = opt
+            elif isinstance(opt, SubCommandGroup):
+                opt.parent = self
+                for sub in opt.subcommands:
+                    sub.parent = opt
+                    routes[(opt.name, sub.name)] = sub
+        self._routes = routes
+
+    def _payload_changed(self):
+        self._build_routes()
+        registry = getattr(self.client, "registry", None)
+        if registry is not None and registry.get(self.name, self.guild) is self:
+            # already added, its payload changed so it has to be synced again
+            self.client._dirty_scopes.add(self.guild)
+            self.client._schedule_sync()
+
+    def subcommand(self, name: str = None, description: str = "No description.",
+                   options: List[Option] = []) -> Callable[[Callable], SubCommand]:
+        """Adds a subcommand, invoked interactions call its callback with its own options
+
+        Parameters
+        ------------
+        name: :class:`~str`
+            Name of the subcommand, defaults to the function name
+        description: Optional[:class:`~str`]
+            Description of the subcommand, (optional)
+        options: Optional[List[:class:`~slash.models.Option`]]
+            Options of the subcommand, detects automatically if None given, (optional)
+
+        Example
+        ----------
+
+        .. code-block:: python3
+
+            @slash.command(name="tag", description="Tags")
+            async def tag(ctx):
+                pass
+
+            @tag.subcommand(name="show", description="Shows a tag")
+            async def tag_show(ctx, name: str):
+                await ctx.reply(tags[name])
+
+        Raises
+        --------
+        ValueError
+            The command has options of its own, discord does not allow
+            them next to subcommands"""
+        self._check_nesting()
+
+        def wrapper(func):
+            sub = SubCommand(self.client, name=name, description=description,
+                             options=options, callback=func, parent=self)
+            self.options.append(sub)
+            self._payload_changed()
+            return sub
+
+        return wrapper
+
+    def autocomplete(self, name: str, *, cache: bool = True):
+        """Sets the coroutine which suggests values for an option while it is typed
+
+        It is called with the :class:`~discord.Interaction` and the typed value
+        and gives up to 25 :class:`Choice`, strings or (name, value) tuples.
+
+        Parameters
+        ------------
+        name: :class:`~str`
+            Name of the option
+        cache: :class:`~bool`
+            Whether suggestions are cached per guild by the typed value,
+            disable it if they depend on the user, defaults to True
+
+        Example
+        ----------
+
+        .. code-block:: python3
+
+            @slash.command(name="tag", description="Shows a tag")
+            async def tag(ctx, name: str):
+                await ctx.reply(tags[name])
+
+            @tag.autocomplete("name")
+            async def tag_names(interaction, value):
+                return [name for name in tags if name.startswith(value)]
+
+        Raises
+        --------
+        ValueError
+            The command has no such option or it has choices"""
+        def wrapper(func):
+            handler = _autocomplete(self, name, cache)(func)
+            self._payload_changed()
+            return handler
+
+        return wrapper
+
+    def group(self, name: str, description: str = "No description.") -> SubCommandGroup:
+        """Adds a subcommand group, its subcommands are added with
+        :meth:`SubCommandGroup.subcommand`
+
+        Parameters
+        ------------
+        name: :class:`~str`
+            Name of the group
+        description: Optional[:class:`~str`]
+            Description of the group, (optional)
+
+        Raises
+        --------
+        ValueError
+            The command has options of its own, discord does not allow
+            them next to groups
+
+        Returns
+        --------
+        :class:`~slash.models.SubCommandGroup`
+            The group"""
+        self._check_nesting()
+        group = SubCommandGroup(self.client, name=name, description=description)
+        self.options.append(group)
+        self._payload_changed()
+        return group
+
     def __str__(self):
         return self.__repr__()
 
@@ -695,6 +1312,10 @@ def command(client: SlashClient, *args, cls: SlashCommand = MISSING, **kwargs):
         Options for the command, detects automatically if None given, (optional)
     cls: :class:`~slash.models.SlashCommand`
         The custom command class, must be a subclass of :class:`~slash.models.SlashCommand`, (optional)
+    cooldown: Optional[:class:`~slash.cooldowns.Cooldown`]
+        Rate limit of the command, (optional)
+    max_concurrency: Optional[:class:`~slash.cooldowns.MaxConcurrency`]
+        How many times the command can run at once, (optional)
 
     Example
     ----------
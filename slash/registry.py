@@ -0,0 +1,141 @@
+from .exceptions import CommandDoesNotExists, CommandExists, CommandNotRegistered
+from .types import SlashCommand, StoredCommand
+
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+
+__all__ = ("CommandRegistry",)
+
+
+class CommandRegistry:
+    """Index of the commands added to a :class:`~slash.client.SlashClient`
+
+    Commands are keyed by their scope and name, so the same name can be
+    used globally and in any number of guilds. Every index is kept up to
+    date on add, replace, remove and bind, so lookups never scan.
+
+    **Attributes**
+
+    Attributes
+    ------------
+    by_id: Dict[:class:`~int`, :class:`~slash.types.StoredCommand`]
+        The synced commands mapped by their id
+    """
+    def __init__(self) -> None:
+        self.by_id: Dict[int, StoredCommand] = {}
+        self._scopes: Dict[Optional[int], Dict[str, SlashCommand]] = {}
+        self._ids: Dict[Optional[int], Dict[str, int]] = {}
+
+    def __repr__(self):
+        return f"<CommandRegistry commands={len(self)} synced={len(self.by_id)}>"
+
+    def __len__(self):
+        return sum(len(scope) for scope in self._scopes.values())
+
+    def __iter__(self) -> Iterator[SlashCommand]:
+        for scope in self._scopes.values():
+            yield from scope.values()
+
+    def scopes(self) -> Tuple[Optional[int], ...]:
+        """Gives every scope which has commands, None is the global scope"""
+        return tuple(self._scopes)
+
+    def scope(self, guild: Optional[int] = None) -> Mapping[str, SlashCommand]:
+        """Gives a read-only view of the commands of a scope
+
+        Parameters
+        ------------
+        guild: Optional[:class:`~int`]
+            The guild id of the scope, None if it is global"""
+        return MappingProxyType(self._scopes.get(guild, {}))
+
+    def get(self, name: str, guild: Optional[int] = None) -> Optional[SlashCommand]:
+        """Gives the command of a scope by its name"""
+        return self._scopes.get(guild, {}).get(name)
+
+    def get_by_id(self, _id: int) -> Optional[SlashCommand]:
+        """Gives a synced command by its id"""
+        stored = self.by_id.get(_id)
+        return stored["command"] if stored is not None else None
+
+    def id_of(self, name: str, guild: Optional[int] = None) -> Optional[int]:
+        """Gives the id of a synced command, None if it is not synced yet"""
+        return self._ids.get(guild, {}).get(name)
+
+    def add(self, command: SlashCommand):
+        """Adds a command to its scope
+
+        Raises
+        -------
+        .CommandExists
+            The scope already has a command with that name"""
+        scope = self._scopes.setdefault(command.guild, {})
+        if command.name in scope:
+            raise CommandExists(
+                f"Command '{command.name}' has already been registered!")
+        scope[command.name] = command
+
+    def replace(self, command: SlashCommand) -> SlashCommand:
+        """Replaces the command of the same scope and name, keeping its id
+
+        Raises
+        -------
+        .CommandNotRegistered
+            The scope has no command with that name
+
+        Returns
+        --------
+        :class:`~slash.models.SlashCommand`
+            The replaced command"""
+        scope = self._scopes.get(command.guild, {})
+        old = scope.get(command.name)
+        if old is None:
+            raise CommandNotRegistered(
+                f"Command '{command.name}' has not been registered.")
+
+        scope[command.name] = command
+        _id = self.id_of(command.name, command.guild)
+        if _id is not None:
+            self.by_id[_id] = {"guild": command.guild, "command": command}
+        return old
+
+    def remove(self, name: str, guild: Optional[int] = None) -> Tuple[SlashCommand, Optional[int]]:
+        """Removes a command from its scope
+
+        Raises
+        -------
+        .CommandDoesNotExists
+            The scope has no command with that name
+
+        Returns
+        --------
+        Tuple[:class:`~slash.models.SlashCommand`, Optional[:class:`~int`]]
+            The removed command and its id, None if it was not synced"""
+        scope = self._scopes.get(guild, {})
+        command = scope.pop(name, None)
+        if command is None:
+            raise CommandDoesNotExists(f"Command '{name}' does not exist!")
+        if not scope:
+            self._scopes.pop(guild, None)
+
+        _id = self._ids.get(guild, {}).pop(name, None)
+        if _id is not None:
+            self.by_id.pop(_id, None)
+        return command, _id
+
+    def bind(self, guild: Optional[int], ids: Dict[str, int]):
+        """Sets the ids of a scope after it was synced, ids of names which
+        are not added locally are ignored and commands missing from ``ids``
+        stay unsynced"""
+        for _id in self._ids.pop(guild, {}).values():
+            self.by_id.pop(_id, None)
+
+        scope = self._scopes.get(guild, {})
+        bound = self._ids[guild] = {}
+        for name, command in scope.items():
+            _id = ids.get(name)
+            if _id is None:
+                continue
+            bound[name] = _id
+            self.by_id[_id] = {"guild": guild, "command": command}
@@ -0,0 +1,234 @@
+import discord
+import asyncio
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+__all__ = (
+    "EntityFetcher",
+    "ResolvedData"
+)
+
+
+class Missing(NamedTuple):
+    """An entity which was neither cached nor resolved and has to be fetched"""
+    kind: str
+    id: int
+
+    def key(self, guild: Optional[discord.Guild]) -> Tuple[Optional[int], int]:
+        """Gives the (guild, id) key of the entity in the entity cache"""
+        return (guild.id if guild is not None and self.kind != "user" else None, self.id)
+
+
+class ResolvedData:
+    """The objects discord sent along with an interaction in ``data['resolved']``
+
+    Objects are built on first access and kept for the interaction.
+
+    Parameters
+    ------------
+    state: :class:`~discord.state.ConnectionState`
+        The connection state of the bot
+    guild: Optional[:class:`~discord.Guild`]
+        The guild of the interaction, None if it is in DMs
+    data: :class:`~dict`
+        The raw ``resolved`` payload
+    """
+    def __init__(self, state, guild: Optional[discord.Guild], data: Optional[dict] = None) -> None:
+        self._state = state
+        self._guild = guild
+        self._data: dict = data or {}
+        self._built: Dict[tuple, object] = {}
+
+    def __repr__(self):
+        return f"<ResolvedData {', '.join(f'{k}={len(v)}' for k, v in self._data.items())}>"
+
+    def __bool__(self):
+        return bool(self._data)
+
+    def _raw(self, kind: str, _id: int) -> Optional[dict]:
+        return self._data.get(kind, {}).get(str(_id))
+
+    def _build(self, kind: str, _id: int, factory):
+        key = (kind, _id)
+        if key not in self._built:
+            try:
+                self._built[key] = factory()
+            except (KeyError, TypeError, ValueError, AttributeError):
+                # partial payloads which this discord.py version can't build an object from
+                self._built[key] = None
+        return self._built[key]
+
+    def user(self, _id: int) -> Optional[Union[discord.Member, discord.User]]:
+        """Gives the member, or the user outside of guilds, of the given id"""
+        user = self._raw("users", _id)
+        if user is None:
+            return None
+
+        member = self._raw("members", _id)
+        if member is not None and self._guild is not None:
+            return self._build("members", _id, lambda: discord.Member(
+                data={**member, "user": user}, guild=self._guild, state=self._state))
+
+        return self._build("users", _id, lambda: discord.User(state=self._state, data=user))
+
+    def role(self, _id: int) -> Optional[discord.Role]:
+        """Gives the role of the given id"""
+        role = self._raw("roles", _id)
+        if role is None or self._guild is None:
+            return None
+
+        return self._build("roles", _id, lambda: discord.Role(
+            guild=self._guild, state=self._state, data=role))
+
+    def channel(self, _id: int) -> Optional[discord.abc.GuildChannel]:
+        """Gives the guild channel of the given id, discord only sends a partial
+        channel so the missing fields are filled with their defaults"""
+        channel = self._raw("channels", _id)
+        if channel is None or self._guild is None:
+            return None
+
+        def factory():
+            cls, _ = discord.channel._guild_channel_factory(channel["type"])
+            if cls is None:
+                return None
+            data = {"position": 0, "permission_overwrites": [], **channel}
+            return cls(state=self._state, guild=self._guild, data=data)
+
+        return self._build("channels", _id, factory)
+
+    def mentionable(self, _id: int) -> Optional[Union[discord.Member, discord.User, discord.Role]]:
+        """Gives the user or role of the given id"""
+        return self.user(_id) or self.role(_id)
+
+
+class EntityFetcher:
+    """Collects the entities of an interaction which have to be fetched and
+    fetches them concurrently, each id only once
+
+    Parameters
+    ------------
+    client: :class:`~slash.client.SlashClient`
+        The slashclient, its ``resolve_stats`` are updated
+    guild: Optional[:class:`~discord.Guild`]
+        The guild of the interaction, None if it is in DMs
+    """
+    # discord caps the user ids of one guild member request
+    MEMBER_BATCH = 100
+
+    def __init__(self, client, guild: Optional[discord.Guild]) -> None:
+        self.client = client
+        self.guild = guild
+        self._wanted: Dict[Tuple[str, int], List[Callable]] = {}
+        self._required: Set[Tuple[str, int]] = set()
+
+    def __repr__(self):
+        return f"<EntityFetcher wanted={len(self._wanted)}>"
+
+    def __len__(self):
+        return len(self._wanted)
+
+    def want(self, missing: Missing, setter: Callable, required: bool = True):
+        """Schedules a fetch, ``setter`` is called with the fetched object
+
+        Parameters
+        ------------
+        missing: :class:`~slash.resolver.Missing`
+            The kind and id of the entity
+        setter: Callable
+            Called with the object once it is fetched
+        required: :class:`~bool`
+            Whether a failed fetch is raised, otherwise ``setter`` is not
+            called for it, defaults to True"""
+        key = (missing.kind, missing.id)
+        self._wanted.setdefault(key, []).append(setter)
+        if required:
+            self._required.add(key)
+
+    def _fetch(self, kind: str, _id: int):
+        bot = self.client.bot
+        if kind == "member":
+            return self.guild.fetch_member(_id)
+        if kind == "user":
+            return bot.fetch_user(_id)
+        if kind == "channel":
+            return self.guild.fetch_channel(_id) if self.guild else bot.fetch_channel(_id)
+        raise ValueError(f"Unknown entity kind '{kind}'")
+
+    async def _query_members(self, ids: List[int]) -> Dict[int, discord.Member]:
+        members = await self.guild.query_members(user_ids=ids, limit=len(ids), cache=True)
+        return {m.id: m for m in members}
+
+    async def run(self):
+        """Fetches every scheduled entity concurrently
+
+        Members of the guild are requested in batches over the gateway when
+        the members intent is enabled, everything else is fetched over REST,
+        as are the members missing from a batch.
+
+        Raises
+        -------
+        :exc:`~discord.HTTPException`
+            A required fetch failed, it is raised after every other fetch finished"""
+        if not self._wanted:
+            return
+
+        stats = self.client.resolve_stats
+        keys, tasks = [], []
+
+        members = [_id for kind, _id in self._wanted if kind == "member"]
+        batched = len(members) > 1 and self.client.bot.intents.members
+        if batched:
+            for i in range(0, len(members), self.MEMBER_BATCH):
+                keys.append(("members", members[i:i + self.MEMBER_BATCH]))
+                tasks.append(self._query_members(members[i:i + self.MEMBER_BATCH]))
+                stats["gateway"] += 1
+
+        for kind, _id in self._wanted:
+            if batched and kind == "member":
+                continue
+            keys.append((kind, _id))
+            tasks.append(self._fetch(kind, _id))
+            stats["rest"] += 1
+
+        found: Dict[Tuple[str, int], object] = {}
+        failed: Dict[Tuple[str, int], BaseException] = {}
+        retry: List[Tuple[str, int]] = []
+        for key, result in zip(keys, await asyncio.gather(*tasks, return_exceptions=True)):
+            if key[0] != "members":
+                if isinstance(result, BaseException):
+                    failed[key] = result
+                else:
+                    found[key] = result
+                continue
+            for _id in key[1]:
+                if isinstance(result, BaseException) or _id not in result:
+                    # not in the batched response, the user left or was never a member
+                    retry.append(("member", _id))
+                else:
+                    found[("member", _id)] = result[_id]
+
+        if retry:
+            stats["rest"] += len(retry)
+            results = await asyncio.gather(*(self._fetch(*key) for key in retry), return_exceptions=True)
+            for key, result in zip(retry, results):
+                if isinstance(result, BaseException):
+                    failed[key] = result
+                else:
+                    found[key] = result
+
+        error = next((failed[key] for key in failed if key in self._required), None)
+        if error is not None:
+            raise error
+
+        cache = self.client.entity_cache
+        for key, setters in self._wanted.items():
+            if key in failed:
+                continue
+            value = found.get(key)
+            if value is not None:
+                cache.set(Missing(*key).key(self.guild), value)
+            for setter in setters:
+                setter(value)
+        self._wanted.clear()
+        self._required.clear()
@@ -0,0 +1,194 @@
+import re
+import discord
+
+from .codec import JSONCodec
+
+from discord import ui
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+__all__ = ("PreparedResponse",)
+
+
+def _fingerprint(embed: discord.Embed) -> tuple:
+    # the setters of an embed replace its dicts and add_field & co change the
+    # length of the fields; the snapshot keeps the objects themselves, so they
+    # compare by identity first and no freed address can be taken for them
+    key = []
+    for slot in embed.__slots__:
+        value = getattr(embed, slot, None)
+        if isinstance(value, list):
+            value = (value, len(value))
+        key.append(value)
+    return tuple(key)
+
+
+class PreparedResponse:
+    """A message which is encoded once and sent as the same bytes every time,
+    with :meth:`~slash.models.InteractionContext.respond`
+
+    Strings of the message may contain ``{slot}`` placeholders for the names
+    given in ``slots``, their values are escaped and spliced into the encoded
+    bytes on every send, nothing else is encoded again.
+
+    The content and the embeds are compared to the ones the bytes were
+    encoded from before every send and encoded again if they were changed,
+    pass ``watch=False`` to skip the comparison and call :meth:`invalidate`
+    after changing them instead. The comparison only looks at the attributes
+    of the embeds, not into their fields, so a field changed in place with
+    :meth:`~discord.Embed.set_field_at` needs :meth:`invalidate` as well.
+    :attr:`ephemeral` is applied on every send.
+
+    Every message gets its own view, built by ``view``, so its timeout,
+    :meth:`~discord.ui.View.stop` and the deletion of its message only
+    affect that message. The components are encoded once from the first
+    view built, so the factory should build the same components each time,
+    call :meth:`invalidate` when they change.
+
+    Parameters
+    ------------
+    content: Optional[:class:`~str`]
+        The content of the message, (optional)
+    embed: Optional[:class:`~discord.Embed`]
+        An embed, (optional)
+    embeds: Optional[List[:class:`~discord.Embed`]]
+        The embeds, (optional)
+    view: Optional[Callable[[], :class:`~discord.ui.View`]]
+        Builds the view of every message, like a view class, (optional)
+    ephemeral: :class:`~bool`
+        Whether only the user can see the message, defaults to False
+    slots: Sequence[:class:`~str`]
+        The names of the placeholders, (optional)
+    watch: :class:`~bool`
+        Whether changes of the content and embeds are detected, defaults to True
+
+    Raises
+    -------
+    TypeError
+        ``view`` is a view instead of a function building one
+
+    Example
+    ---------
+
+    .. code-block:: python3
+
+        WELCOME = PreparedResponse(embed=discord.Embed(title="Welcome {user}!",
+                                                       description=RULES),
+                                   view=RulesView,
+                                   slots=("user",))
+
+        @slash.command(name="welcome", description="Welcomes you")
+        async def welcome(ctx):
+            await ctx.respond(WELCOME, user=ctx.user.name)
+
+    **Attributes**
+
+    Attributes
+    ------------
+    compiles: :class:`~int`
+        Number of times the message was encoded
+    """
+    def __init__(self,
+                 content: Optional[str] = None,
+                 *,
+                 embed: Optional[discord.Embed] = None,
+                 embeds: Optional[List[discord.Embed]] = None,
+                 view: Optional[Callable[[], ui.View]] = None,
+                 ephemeral: bool = False,
+                 slots: Sequence[str] = (),
+                 watch: bool = True) -> None:
+        if isinstance(view, ui.View):
+            raise TypeError("view must build a new view for every message, pass its class or a function")
+        self.content = content
+        self.embeds: List[discord.Embed] = list(embeds or []) + ([embed] if embed else [])
+        self.view = view
+        self.ephemeral = ephemeral
+        self.slots = tuple(slots)
+        self.watch = watch
+        self.compiles: int = 0
+        self._codec: Optional[JSONCodec] = None
+        self._snapshot: Optional[tuple] = None
+        # encoded literal bytes alternating with slot names, starting and ending with bytes
+        self._parts: List[Any] = []
+        self._pattern = re.compile(rb"\{(" + b"|".join(re.escape(s.encode()) for s in self.slots) + rb")\}") \
+            if self.slots else None
+
+    def __repr__(self):
+        return f"<PreparedResponse embeds={len(self.embeds)} view={self.view is not None} slots={self.slots}>"
+
+    def _sources(self) -> tuple:
+        return (self.content, self.view, [_fingerprint(e) for e in self.embeds])
+
+    def invalidate(self):
+        """Drops the encoded bytes, the next send encodes the message again"""
+        self._snapshot = None
+        self._parts = []
+
+    def _compile(self, codec: JSONCodec, sources: tuple):
+        data: Dict[str, Any] = {"content": self.content}
+        if self.embeds:
+            data["embeds"] = [e.to_dict() for e in self.embeds]
+        if self.view is not None:
+            data["components"] = self.view().to_components()
+
+        # encoded without the flags, they are spliced in for the messages which take them
+        raw = codec.dumps(data)
+        if self._pattern is None:
+            self._parts = [raw]
+        else:
+            self._parts = self._pattern.split(raw)
+            # split gives the captured slot names as bytes
+            self._parts[1::2] = [name.decode() for name in self._parts[1::2]]
+        self._codec = codec
+        self._snapshot = sources
+        self.compiles += 1
+
+    def render(self, codec: JSONCodec, **values: Any) -> bytes:
+        """Gives the encoded message with the values of the slots
+
+        Parameters
+        ------------
+        codec: :class:`~slash.codec.JSONCodec`
+            The codec the message is encoded with
+        **values
+            The values of the slots, converted with :func:`str`
+
+        Raises
+        -------
+        TypeError
+            A slot has no value or a value has no slot
+
+        Returns
+        --------
+        :class:`~bytes`
+            The json message"""
+        return self._render(codec, values, True)
+
+    def _check(self, values: Dict[str, Any]):
+        if set(values) != set(self.slots):
+            raise TypeError(f"Expected values for the slots {self.slots}, got {tuple(values)}")
+
+    def _render(self, codec: JSONCodec, values: Dict[str, Any], flags: bool) -> bytes:
+        # edits take no flags
+        self._check(values)
+
+        if self._snapshot is None or codec is not self._codec:
+            self._compile(codec, self._sources())
+        elif self.watch:
+            sources = self._sources()
+            if sources != self._snapshot:
+                self._compile(codec, sources)
+
+        parts = self._parts
+        if len(parts) == 1:
+            raw = parts[0]
+        else:
+            out = parts[:]
+            for i in range(1, len(out), 2):
+                # encoded as a json string without its quotes, so it is escaped like the rest
+                out[i] = codec.dumps(str(values[out[i]]))[1:-1]
+            raw = b"".join(out)
+
+        if flags and self.ephemeral:
+            return b'{"flags":64,' + raw[1:]
+        return raw
@@ -0,0 +1,250 @@
+import sys
+import json
+import time
+import asyncio
+import sqlite3
+import traceback
+
+from .cache import TTLCache
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+
+__all__ = (
+    "MemoryStateStore",
+    "SQLiteStateStore",
+    "StateStore"
+)
+
+_NOTHING = object()
+
+
+class StateStore:
+    """Base class of the stores which keep the state of component views so
+    they can be rebuilt by another process or after a restart
+
+    States are keyed by custom id and must be json serialisable, subclasses
+    implement :meth:`get`, :meth:`set` and :meth:`delete`.
+    """
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Gives the state of a key, None if it is unknown or expired"""
+        raise NotImplementedError
+
+    async def set(self, key: str, state: Dict[str, Any], ttl: Optional[float] = None):
+        """Stores the state of a key
+
+        Parameters
+        ------------
+        key: :class:`~str`
+            The key
+        state: :class:`~dict`
+            The json serialisable state
+        ttl: Optional[:class:`~float`]
+            Seconds the state is kept, None keeps it forever, defaults to None
+
+        Raises
+        -------
+        TypeError
+            The state is not json serialisable"""
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        """Removes the state of a key"""
+        raise NotImplementedError
+
+    async def flush(self):
+        """Writes every pending change"""
+
+    async def close(self):
+        """Flushes and releases the store"""
+        await self.flush()
+
+
+class MemoryStateStore(StateStore):
+    """Keeps the states in the memory of this process, they are lost on restart
+
+    Parameters
+    ------------
+    maxsize: :class:`~int`
+        Maximum number of states, the least recently used one is dropped when
+        full, defaults to 100000
+    """
+    def __init__(self, maxsize: int = 100000) -> None:
+        self._data = TTLCache(maxsize)
+
+    def __repr__(self):
+        return f"<MemoryStateStore size={len(self._data)}>"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self._data.get(key)
+        # stored encoded so callers never share one mutable state
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, state: Dict[str, Any], ttl: Optional[float] = None):
+        self._data.set(key, json.dumps(state), ttl)
+
+    async def delete(self, key: str):
+        self._data.pop(key)
+
+
+class SQLiteStateStore(StateStore):
+    """Keeps the states in a SQLite database file, which survives restarts and
+    can be shared by the shard processes of one machine
+
+    Writes are queued and written in one transaction per batch on a
+    background thread, so the event loop never waits on the disk. Reads go
+    to the database, unless ``cache_ttl`` enables a cache of recently used
+    states, which only a store not shared with other processes should do.
+
+    Parameters
+    ------------
+    path: :class:`~str`
+        Path of the database file, it is created if needed
+    cache_size: :class:`~int`
+        Number of states kept in memory when the cache is enabled, defaults to 1024
+    cache_ttl: :class:`~float`
+        Seconds a cached state is trusted, a change made by another process
+        goes unseen for that long, 0 disables the cache, defaults to 0
+    flush_interval: :class:`~float`
+        Seconds changes are collected before they are written, other
+        processes see a change this much later, defaults to 0.25
+    max_batch: :class:`~int`
+        Number of pending changes after which :meth:`set` waits for them to be
+        written, defaults to 500
+
+    **Attributes**
+
+    Attributes
+    ------------
+    cache: :class:`~slash.cache.TTLCache`
+        The cached states, see :meth:`~slash.cache.TTLCache.stats`
+    flushes: :class:`~int`
+        Number of batches written
+    writes: :class:`~int`
+        Number of changes written
+    """
+    def __init__(self,
+                 path: str,
+                 *,
+                 cache_size: int = 1024,
+                 cache_ttl: float = 0.0,
+                 flush_interval: float = 0.25,
+                 max_batch: int = 500) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.cache: TTLCache = TTLCache(cache_size, cache_ttl)
+        self.flushes: int = 0
+        self.writes: int = 0
+        self._db: Optional[sqlite3.Connection] = None
+        # one thread, so the connection is only ever used by one thread at a time
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="slash-state")
+        self._pending: Dict[str, Optional[Tuple[str, Optional[float]]]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def __repr__(self):
+        return f"<SQLiteStateStore path='{self.path}' pending={len(self._pending)}>"
+
+    async def _run(self, func, *args):
+        return await asyncio.get_event_loop().run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS component_state "
+                "(key TEXT PRIMARY KEY, state TEXT NOT NULL, expires REAL)")
+            # every flush deletes the expired states
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS component_state_expires ON component_state (expires)")
+        return self._db
+
+    def _read(self, key: str) -> Tuple[Optional[str], Optional[float]]:
+        row = self._connect().execute(
+            "SELECT state, expires FROM component_state WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None, None
+        return row
+
+    def _write(self, batch: Dict[str, Optional[Tuple[str, Optional[float]]]]):
+        upserts = [(key, *entry) for key, entry in batch.items() if entry is not None]
+        deletes = [(key,) for key, entry in batch.items() if entry is None]
+        db = self._connect()
+        with db:
+            db.executemany("INSERT OR REPLACE INTO component_state VALUES (?, ?, ?)", upserts)
+            db.executemany("DELETE FROM component_state WHERE key = ?", deletes)
+            db.execute("DELETE FROM component_state WHERE expires <= ?", (time.time(),))
+
+    def _cache(self, key: str, raw: Optional[str], expires: Optional[float]):
+        if raw is None or not self.cache.ttl:
+            # unknown keys are never cached, another process may save them any moment
+            self.cache.pop(key)
+            return
+        ttl = self.cache.ttl
+        if expires is not None:
+            ttl = min(max(expires - time.time(), 0.0), ttl)
+        self.cache.set(key, raw, ttl)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        pending = self._pending.get(key, _NOTHING)
+        if pending is not _NOTHING:
+            return json.loads(pending[0]) if pending is not None else None
+
+        raw = self.cache.get(key, _NOTHING) if self.cache.ttl else _NOTHING
+        if raw is _NOTHING:
+            raw, expires = await self._run(self._read, key)
+            self._cache(key, raw, expires)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, state: Dict[str, Any], ttl: Optional[float] = None):
+        raw = json.dumps(state)
+        expires = time.time() + ttl if ttl is not None else None
+        self._cache(key, raw, expires)
+        await self._queue(key, (raw, expires))
+
+    async def delete(self, key: str):
+        self._cache(key, None, None)
+        await self._queue(key, None)
+
+    async def _queue(self, key: str, entry: Optional[Tuple[str, Optional[float]]]):
+        self._pending[key] = entry
+        if len(self._pending) >= self.max_batch:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_event_loop().create_task(self._flush_later())
+            self._flush_task.add_done_callback(self._flush_done)
+
+    @staticmethod
+    def _flush_done(task: asyncio.Task):
+        # nothing awaits the background flush, its batch is kept for the next one
+        if not task.cancelled() and task.exception() is not None:
+            error = task.exception()
+            print("Flushing the component states failed, retrying with the next change:", file=sys.stderr)
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        try:
+            await self._run(self._write, batch)
+        except Exception:
+            # keep the batch for the next flush, newer changes of a key win
+            self._pending = {**batch, **self._pending}
+            raise
+        self.flushes += 1
+        self.writes += len(batch)
+
+    async def close(self):
+        await self.flush()
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,309 @@
+import os
+import json
+import hashlib
+
+from typing import Dict, List, Optional, Tuple
+
+
+__all__ = (
+    "CommandManifest",
+    "ScopeDiff",
+    "SyncReport"
+)
+
+
+def _normalize_option(data: dict) -> dict:
+    ret = {
+        "type": int(data["type"]),
+        "name": data["name"],
+        "description": data.get("description") or "",
+        "required": bool(data.get("required", False))
+    }
+    if data.get("choices"):
+        ret["choices"] = [{"name": c["name"], "value": c["value"]} for c in data["choices"]]
+    if data.get("options"):
+        ret["options"] = [_normalize_option(o) for o in data["options"]]
+    if data.get("autocomplete"):
+        ret["autocomplete"] = True
+    return ret
+
+
+def normalize_payload(data: dict) -> dict:
+    """Strips a command payload down to the fields discord compares,
+    so a local :meth:`~slash.models.SlashCommand.ret_dict` and a
+    fetched command can be checked for equality.
+
+    Parameters
+    ------------
+    data: :class:`~dict`
+        The command payload, local or remote
+
+    Returns
+    --------
+    :class:`~dict`
+        The normalized payload"""
+    return {
+        "type": int(data.get("type") or 1),
+        "name": data["name"],
+        "description": data.get("description") or "",
+        "default_permission": bool(data.get("default_permission", True)),
+        "options": [_normalize_option(o) for o in data.get("options") or []]
+    }
+
+
+def scope_hash(payloads: Dict[str, dict]) -> str:
+    """Stable hash of the payloads of one scope, it does not depend
+    on the order in which commands were added.
+
+    Parameters
+    ------------
+    payloads: Dict[:class:`~str`, :class:`~dict`]
+        The local payloads mapped by command name
+
+    Returns
+    --------
+    :class:`~str`
+        The hex digest"""
+    data = [normalize_payload(payloads[name]) for name in sorted(payloads)]
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CommandManifest:
+    """On-disk record of the last synced payload hash and command ids of
+    every scope, used to skip syncing scopes which did not change
+
+    Parameters
+    ------------
+    path: :class:`~str`
+        Path of the json file, it is created on the first save
+
+    **Attributes**
+
+    Attributes
+    ------------
+    application_id: Optional[:class:`~int`]
+        The application the manifest was written for
+    """
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.application_id: Optional[int] = None
+        self._scopes: Dict[Optional[int], dict] = {}
+        self.load()
+
+    def __repr__(self):
+        return f"<CommandManifest path='{self.path}' scopes={len(self._scopes)}>"
+
+    @staticmethod
+    def _key(guild: Optional[int]) -> str:
+        return "global" if guild is None else str(guild)
+
+    def load(self):
+        """Reads the manifest from disk, a missing or corrupt file is treated as empty"""
+        self._scopes = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return
+
+        self.application_id = data.get("application_id")
+        for key, scope in data.get("scopes", {}).items():
+            guild = None if key == "global" else int(key)
+            self._scopes[guild] = {
+                "hash": scope["hash"],
+                "ids": {name: int(_id) for name, _id in scope["ids"].items()}
+            }
+
+    def save(self):
+        """Writes the manifest to disk atomically"""
+        data = {
+            "version": self.VERSION,
+            "application_id": self.application_id,
+            "scopes": {self._key(guild): scope for guild, scope in self._scopes.items()}
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def lookup(self, application_id: int, guild: Optional[int], digest: str) -> Optional[Dict[str, int]]:
+        """Gives the stored command ids of a scope if its hash still matches
+
+        Parameters
+        ------------
+        application_id: :class:`~int`
+            The id of the running application
+        guild: Optional[:class:`~int`]
+            The guild id of the scope, None if it is global
+        digest: :class:`~str`
+            The current hash of the scope
+
+        Returns
+        --------
+        Optional[Dict[:class:`~str`, :class:`~int`]]
+            The ids mapped by name, None if the scope changed"""
+        if self.application_id != application_id:
+            return None
+        scope = self._scopes.get(guild)
+        if scope is None or scope["hash"] != digest:
+            return None
+        return dict(scope["ids"])
+
+    def update(self, application_id: int, guild: Optional[int], digest: str, ids: Dict[str, int]):
+        """Records the hash and ids of a freshly synced scope"""
+        if self.application_id != application_id:
+            self._scopes = {}
+            self.application_id = application_id
+        self._scopes[guild] = {"hash": digest, "ids": dict(ids)}
+
+    def routes(self) -> Dict[int, Tuple[Optional[int], str]]:
+        """Gives the stored (guild, name) of every command id
+
+        Returns
+        --------
+        Dict[:class:`~int`, Tuple[Optional[:class:`~int`], :class:`~str`]]
+            The routes mapped by command id"""
+        return {_id: (guild, name) for guild, scope in self._scopes.items()
+                for name, _id in scope["ids"].items()}
+
+    def discard(self, guild: Optional[int]):
+        """Forgets a scope so it is synced again on the next start"""
+        self._scopes.pop(guild, None)
+
+
+class ScopeDiff:
+    """The difference between the local and remote commands of one scope
+
+    **Attributes**
+
+    Attributes
+    ------------
+    guild: Optional[:class:`~int`]
+        The guild id of the scope, None if it is global
+    created: List[:class:`~str`]
+        Names of the commands which are not registered yet
+    updated: List[:class:`~str`]
+        Names of the commands whose payload has changed
+    deleted: List[:class:`~str`]
+        Names of the remote commands which are not registered locally
+    unchanged: List[:class:`~str`]
+        Names of the commands which are already up to date
+    cached: :class:`~bool`
+        Whether the scope was skipped because it matched the manifest
+    requests: :class:`~int`
+        Number of HTTP requests made for this scope
+    ids: Dict[:class:`~str`, :class:`~int`]
+        The command ids of this scope mapped by name
+    """
+    def __init__(self, guild: Optional[int] = None) -> None:
+        self.guild = guild
+        self.created: List[str] = []
+        self.updated: List[str] = []
+        self.deleted: List[str] = []
+        self.unchanged: List[str] = []
+        self.cached: bool = False
+        self.requests: int = 0
+        self.ids: Dict[str, int] = {}
+
+    def __repr__(self):
+        return (f"<ScopeDiff guild={self.guild} created={self.created} updated={self.updated} "
+                f"deleted={self.deleted} unchanged={len(self.unchanged)} requests={self.requests}>")
+
+    @property
+    def changed(self) -> bool:
+        """Whether anything has to be written for this scope"""
+        return bool(self.created or self.updated or self.deleted)
+
+    @classmethod
+    def compute(cls, guild: Optional[int], local: Dict[str, dict], remote: List[dict]) -> 'ScopeDiff':
+        """Compares local payloads with the fetched commands of a scope
+
+        Parameters
+        ------------
+        guild: Optional[:class:`~int`]
+            The guild id of the scope, None if it is global
+        local: Dict[:class:`~str`, :class:`~dict`]
+            The local payloads mapped by command name
+        remote: List[:class:`~dict`]
+            The commands fetched from discord
+
+        Returns
+        --------
+        :class:`~slash.sync.ScopeDiff`
+            The difference"""
+        self = cls(guild)
+        remote_by_name = {}
+        for data in remote:
+            if int(data.get("type") or 1) == 1:
+                remote_by_name[data["name"]] = data
+                self.ids[data["name"]] = int(data["id"])
+
+        for name, payload in local.items():
+            data = remote_by_name.get(name)
+            if data is None:
+                self.created.append(name)
+            elif normalize_payload(payload) != normalize_payload(data):
+                self.updated.append(name)
+            else:
+                self.unchanged.append(name)
+
+        self.deleted.extend(name for name in remote_by_name if name not in local)
+        return self
+
+
+class SyncReport:
+    """Report returned by :meth:`~slash.client.SlashClient.sync_commands`
+
+    **Attributes**
+
+    Attributes
+    ------------
+    scopes: Dict[Optional[:class:`~int`], :class:`~slash.sync.ScopeDiff`]
+        The diff of every synced scope, None is the global scope
+    """
+    def __init__(self) -> None:
+        self.scopes: Dict[Optional[int], ScopeDiff] = {}
+
+    def __repr__(self):
+        return (f"<SyncReport scopes={len(self.scopes)} created={len(self.created)} "
+                f"updated={len(self.updated)} deleted={len(self.deleted)} requests={self.requests}>")
+
+    def add(self, diff: ScopeDiff):
+        self.scopes[diff.guild] = diff
+
+    def merge(self, other: 'SyncReport'):
+        self.scopes.update(other.scopes)
+
+    def _collect(self, attr: str) -> List[Tuple[Optional[int], str]]:
+        return [(guild, name) for guild, diff in self.scopes.items() for name in getattr(diff, attr)]
+
+    @property
+    def created(self) -> List[Tuple[Optional[int], str]]:
+        """(guild, name) pairs of the created commands"""
+        return self._collect("created")
+
+    @property
+    def updated(self) -> List[Tuple[Optional[int], str]]:
+        """(guild, name) pairs of the updated commands"""
+        return self._collect("updated")
+
+    @property
+    def deleted(self) -> List[Tuple[Optional[int], str]]:
+        """(guild, name) pairs of the deleted commands"""
+        return self._collect("deleted")
+
+    @property
+    def requests(self) -> int:
+        """Total number of HTTP requests made"""
+        return sum(diff.requests for diff in self.scopes.values())
+
+    @property
+    def changed(self) -> bool:
+        """Whether any scope had to be written"""
+        return any(diff.changed for diff in self.scopes.values())
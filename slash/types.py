@@ -1,6 +1,9 @@
 import discord
 
 from .enums import MessageFlags
+from .views import ViewStore
+from .http import InteractionHTTP
+from .codec import JSONCodec
 
 from discord import ui
 from types import FunctionType
@@ -82,7 +85,9 @@ class SlashCommand:
 class SlashClient:
 	bot: commands.Bot
 	_listeners: Dict[str, SlashCommand]
-	_views: Dict[str, Tuple[ui.View, Item]]
+	views: ViewStore
+	interaction_http: InteractionHTTP
+	codec: JSONCodec
 
 	async def get_commands(self) -> List['SlashCommand']:
 		...
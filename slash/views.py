@@ -0,0 +1,264 @@
+import time
+import asyncio
+
+from discord import ui
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+
+__all__ = ("ViewStore",)
+
+
+class _Entry:
+    __slots__ = ("ids", "messages", "expires", "timer")
+
+    def __init__(self) -> None:
+        self.ids: Set[str] = set()
+        self.messages: Set[int] = set()
+        self.expires: Optional[float] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class ViewStore:
+    """The views sent by interaction responses, routing component interactions
+    to their item by ``custom_id``
+
+    A view is dropped when it times out, after ``view.timeout`` seconds without
+    being used like discord.py does, when it was stopped, when its message is
+    deleted or when the store is full and it is the least recently used one.
+
+    Parameters
+    ------------
+    maxsize: :class:`~int`
+        Maximum number of views, defaults to 5000
+    ttl: Optional[:class:`~float`]
+        Seconds without being used after which a view without timeout is
+        dropped, None keeps them until evicted, defaults to None
+
+    **Attributes**
+
+    Attributes
+    ------------
+    hits: :class:`~int`
+        Number of component interactions routed to a view
+    unknown: :class:`~int`
+        Number of component interactions which were routed neither to a
+        view nor to a component handler, counted by the client
+    evictions: :class:`~int`
+        Number of views dropped because the store was full
+    timeouts: :class:`~int`
+        Number of views dropped because they timed out
+    """
+    def __init__(self, maxsize: int = 5000, ttl: Optional[float] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits: int = 0
+        self.unknown: int = 0
+        self.evictions: int = 0
+        self.timeouts: int = 0
+        self._views: 'OrderedDict[ui.View, _Entry]' = OrderedDict()
+        self._items: Dict[str, Tuple[ui.View, ui.Item]] = {}
+        self._messages: Dict[int, Set[ui.View]] = {}
+
+    def __repr__(self):
+        return f"<ViewStore views={len(self._views)} items={len(self._items)} maxsize={self.maxsize}>"
+
+    def __len__(self):
+        return len(self._views)
+
+    def __contains__(self, custom_id: str) -> bool:
+        return custom_id in self._items
+
+    def add(self, view: ui.View, message_id: Optional[int] = None):
+        """Stores a view, or refreshes its items if it is stored already
+
+        Only items with a custom id which was given explicitly are routed,
+        views without any are not stored.
+
+        Parameters
+        ------------
+        view: :class:`~discord.ui.View`
+            The view
+        message_id: Optional[:class:`~int`]
+            The id of the message the view was sent with, (optional)"""
+        entry = self._views.get(view)
+        if entry is None:
+            entry = _Entry()
+
+        ids = set()
+        for item in view.children:
+            if not getattr(item, "_provided_custom_id", False):
+                continue
+            owner = self._items.get(item.custom_id)
+            if owner is not None and owner[0] is not view:
+                # the custom id is reused by a newer view
+                self._views[owner[0]].ids.discard(item.custom_id)
+            self._items[item.custom_id] = (view, item)
+            ids.add(item.custom_id)
+
+        for custom_id in entry.ids - ids:
+            if self._items.get(custom_id, (None,))[0] is view:
+                del self._items[custom_id]
+        entry.ids = ids
+
+        if not ids:
+            if view in self._views:
+                self.remove_view(view)
+            return
+
+        self._views[view] = entry
+        self._views.move_to_end(view)
+        if message_id is not None:
+            self.bind(view, message_id)
+        self._touch(view, entry)
+
+        if len(self._views) > self.maxsize:
+            self.sweep()
+        while len(self._views) > self.maxsize:
+            self._drop(next(iter(self._views)))
+            self.evictions += 1
+
+    def bind(self, view: ui.View, message_id: int):
+        """Indexes a stored view by the id of a message it was sent with"""
+        entry = self._views.get(view)
+        if entry is None:
+            return
+        entry.messages.add(message_id)
+        self._messages.setdefault(message_id, set()).add(view)
+
+    def get(self, custom_id: str, message_id: Optional[int] = None) -> Optional[Tuple[ui.View, ui.Item]]:
+        """Gives the view and item of a custom id and refreshes the timeout
+        of the view, None if it is unknown or the view was stopped
+
+        With ``message_id`` the views sent with that message are looked in
+        first, so views sharing custom ids each get the clicks of their own
+        messages. It is None when the newest view of the custom id is known
+        to be sent with other messages only."""
+        found = None
+        if message_id is not None:
+            for view in self._messages.get(message_id, ()):
+                item = next((i for i in view.children if getattr(i, "_provided_custom_id", False)
+                             and i.custom_id == custom_id), None)
+                if item is not None:
+                    found = (view, item)
+                    break
+
+        if found is None:
+            found = self._items.get(custom_id)
+            if found is not None and message_id is not None:
+                messages = self._views[found[0]].messages
+                if messages and message_id not in messages:
+                    found = None
+        if found is None:
+            return None
+
+        view = found[0]
+        if view.is_finished():
+            self._drop(view)
+            return None
+
+        self._views.move_to_end(view)
+        self._touch(view, self._views[view])
+        self.hits += 1
+        return found
+
+    def remove_view(self, view: ui.View) -> bool:
+        """Removes a view, gives whether it was stored"""
+        if view not in self._views:
+            return False
+        self._drop(view)
+        return True
+
+    def remove_message(self, message_id: int) -> int:
+        """Removes every view sent with a message
+
+        Returns
+        --------
+        :class:`~int`
+            Number of removed views"""
+        views = self._messages.pop(message_id, ())
+        for view in list(views):
+            self._drop(view)
+        return len(views)
+
+    def sweep(self) -> int:
+        """Drops every stopped view
+
+        Returns
+        --------
+        :class:`~int`
+            Number of dropped views"""
+        stopped = [view for view in self._views if view.is_finished()]
+        for view in stopped:
+            self._drop(view)
+        return len(stopped)
+
+    def clear(self):
+        """Removes every view"""
+        for entry in self._views.values():
+            if entry.timer is not None:
+                entry.timer.cancel()
+        self._views.clear()
+        self._items.clear()
+        self._messages.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Gives the size and counters of the store"""
+        return {
+            "views": len(self._views),
+            "items": len(self._items),
+            "messages": len(self._messages),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "unknown": self.unknown,
+            "evictions": self.evictions,
+            "timeouts": self.timeouts
+        }
+
+    def _lifetime(self, view: ui.View) -> Optional[float]:
+        return view.timeout if view.timeout is not None else self.ttl
+
+    def _touch(self, view: ui.View, entry: _Entry):
+        lifetime = self._lifetime(view)
+        if lifetime is None:
+            entry.expires = None
+            return
+
+        entry.expires = time.monotonic() + lifetime
+        if entry.timer is None:
+            # one timer per view, a refreshed expiry only pushes it back when it fires
+            entry.timer = asyncio.get_event_loop().call_later(lifetime, self._expire, view)
+
+    def _expire(self, view: ui.View):
+        entry = self._views.get(view)
+        if entry is None:
+            return
+        entry.timer = None
+        if entry.expires is None:
+            return
+
+        remaining = entry.expires - time.monotonic()
+        if remaining > 0:
+            entry.timer = asyncio.get_event_loop().call_later(remaining, self._expire, view)
+            return
+
+        self._drop(view)
+        self.timeouts += 1
+        if view.timeout is not None:
+            view._dispatch_timeout()
+
+    def _drop(self, view: ui.View):
+        entry = self._views.pop(view)
+        if entry.timer is not None:
+            entry.timer.cancel()
+        for custom_id in entry.ids:
+            if self._items.get(custom_id, (None,))[0] is view:
+                del self._items[custom_id]
+        for message_id in entry.messages:
+            views = self._messages.get(message_id)
+            if views is not None:
+                views.discard(view)
+                if not views:
+                    del self._messages[message_id]